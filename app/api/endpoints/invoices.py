@@ -9,6 +9,7 @@ from typing import List, Optional
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
@@ -22,7 +23,7 @@ from app.services.invoice_service import InvoiceService
 from app.models.invoice import Invoice
 from app.models.recommendation import ProcessingRecommendation
 from app.config import settings
-from app.core.database import get_db_context
+from app.core.database import get_db, get_db_context
 from app.models.database_models import InvoiceDB
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ recommendation_engine = RecommendationEngine()
 async def process_invoice(
     file: UploadFile = File(..., description="Invoice file to process"),
     auto_approve: bool = Query(False, description="Auto-approve if within thresholds"),
+    db: Session = Depends(get_db),
 ):
     """
     Process an uploaded invoice and generate processing recommendation
@@ -95,8 +97,9 @@ async def process_invoice(
         # Process invoice
         invoice = document_processor.process_invoice_file(file_path)
 
-        # Find matching PO
-        matching_po = po_matcher.find_matching_po(invoice)
+        # Find matching PO on a worker thread so its DB lookups don't block the event loop;
+        # every lookup the matcher makes shares the request's session
+        matching_po = await run_in_threadpool(po_matcher.find_matching_po, invoice, db=db)
 
         # Validate against PO if found
         if matching_po:
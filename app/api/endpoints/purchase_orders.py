@@ -6,17 +6,20 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db_context
+from app.core.database import get_db, get_db_context
 from app.services.po_folder_service import POFolderService, POFolderHandler
+from app.services.po_service import POService
 from app.models.database_models import PurchaseOrderDB, POLineItemDB
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 po_folder_service = POFolderService()
+po_service = POService()
 
 class CreatePORequest(BaseModel):
     """Request model for creating a PO manually"""
@@ -41,6 +44,7 @@ async def list_purchase_orders(
     max_amount: Optional[float] = Query(None),
     limit: int = Query(50),
     offset: int = Query(0),
+    after_po_number: Optional[str] = Query(None),
 ):
     """List all stored purchase orders"""
     try:
@@ -61,8 +65,13 @@ async def list_purchase_orders(
             # Get total count
             total_count = query.count()
             
-            # Apply pagination
-            pos = query.offset(offset).limit(limit).all()
+            # Apply pagination - keyset cursor when given, offset otherwise
+            query = query.order_by(PurchaseOrderDB.po_number)
+            if after_po_number:
+                query = query.filter(PurchaseOrderDB.po_number > after_po_number)
+            else:
+                query = query.offset(offset)
+            pos = query.limit(limit).all()
             
             # Convert to dict format
             po_list = []
@@ -87,7 +96,8 @@ async def list_purchase_orders(
                 "purchase_orders": po_list,
                 "total_count": total_count,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "next_after_po_number": pos[-1].po_number if len(pos) == limit else None
             }
             
     except Exception as e:
@@ -186,8 +196,7 @@ async def upload_purchase_order(file: UploadFile = File(...)):
         try:
             # First extract text from the PDF
             logger.info(f"Extracting text from PDF: {temp_file_path}")
-            from app.core.document_processor import DocumentProcessor
-            document_processor = DocumentProcessor()
+            document_processor = po_folder_service.document_processor
             
             extracted_text = document_processor.extract_text_from_pdf(temp_file_path)
             
@@ -201,7 +210,7 @@ async def upload_purchase_order(file: UploadFile = File(...)):
             
             # Store to database using folder service
             with get_db_context() as db:
-                handler = POFolderHandler(db)
+                handler = POFolderHandler(db, document_processor)
                 handler._store_po_data(po_data, temp_file_path, handler._get_file_hash(temp_file_path))
             
             return {
@@ -220,13 +229,25 @@ async def upload_purchase_order(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Error processing PO: {str(e)}")
 
 @router.get("/vendor/{vendor_name}")
-async def get_pos_by_vendor(vendor_name: str):
+async def get_pos_by_vendor(
+    vendor_name: str,
+    limit: int = Query(50),
+    after_po_number: Optional[str] = Query(None),
+):
     """Get purchase orders by vendor name"""
     try:
         with get_db_context() as db:
-            pos = db.query(PurchaseOrderDB).filter(
+            query = db.query(PurchaseOrderDB).filter(
                 PurchaseOrderDB.vendor_name.ilike(f"%{vendor_name}%")
-            ).all()
+            )
+            
+            # Count every matching PO, not just the page being returned
+            total_count = query.count()
+            
+            query = query.order_by(PurchaseOrderDB.po_number)
+            if after_po_number:
+                query = query.filter(PurchaseOrderDB.po_number > after_po_number)
+            pos = query.limit(limit).all()
             
             po_list = []
             for po in pos:
@@ -243,7 +264,9 @@ async def get_pos_by_vendor(vendor_name: str):
             return {
                 "vendor_name": vendor_name,
                 "purchase_orders": po_list,
-                "total_count": len(po_list)
+                "total_count": total_count,
+                "limit": limit,
+                "next_after_po_number": pos[-1].po_number if len(pos) == limit else None
             }
             
     except Exception as e:
@@ -251,51 +274,7 @@ async def get_pos_by_vendor(vendor_name: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/statistics/summary")
-async def get_po_statistics():
+async def get_po_statistics(db: Session = Depends(get_db)):
     """Get purchase order statistics"""
-    try:
-        with get_db_context() as db:
-            total_pos = db.query(PurchaseOrderDB).count()
-            total_amount = db.query(PurchaseOrderDB.total_amount).scalar() or 0
-            
-            # Count by status
-            status_counts = {}
-            status_results = db.query(PurchaseOrderDB.status, db.func.count(PurchaseOrderDB.id))\
-                .group_by(PurchaseOrderDB.status).all()
-            
-            for status, count in status_results:
-                status_counts[status] = count
-            
-            # Count by vendor
-            vendor_counts = {}
-            vendor_results = db.query(PurchaseOrderDB.vendor_name, db.func.count(PurchaseOrderDB.id))\
-                .group_by(PurchaseOrderDB.vendor_name).all()
-            
-            for vendor, count in vendor_results:
-                vendor_counts[vendor] = count
-            
-            # Average PO amount
-            avg_amount = total_amount / total_pos if total_pos > 0 else 0
-            
-            stats = {
-                "total_pos": total_pos,
-                "total_amount": float(total_amount),
-                "average_amount": float(avg_amount),
-                "status_distribution": status_counts,
-                "vendor_distribution": vendor_counts,
-                "last_updated": datetime.utcnow().isoformat()
-            }
-            
-            return stats
-            
-    except Exception as e:
-        logger.error(f"Error generating PO statistics: {e}")
-        return {
-            "total_pos": 0,
-            "total_amount": 0.0,
-            "average_amount": 0.0,
-            "status_distribution": {},
-            "vendor_distribution": {},
-            "last_updated": datetime.utcnow().isoformat(),
-            "error": str(e)
-        }
+    # Sync DB work runs on a worker thread so concurrent requests overlap
+    return await run_in_threadpool(po_service.get_po_statistics, db=db)
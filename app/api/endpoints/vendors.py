@@ -3,6 +3,7 @@ Vendor API endpoints
 """
 
 import logging
+from operator import attrgetter
 from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
@@ -18,6 +19,9 @@ router = APIRouter()
 # Initialize service
 vendor_service = VendorService()
 
+_get_status = attrgetter("status")
+_get_category = attrgetter("category")
+
 
 class CreateVendorRequest(BaseModel):
     """Request model for creating a vendor"""
@@ -45,12 +49,19 @@ async def list_vendors(
 
         # Apply filters
         if status:
-            vendors = [v for v in vendors if v["status"].upper() == status.upper()]
+            wanted_status = status.upper()
+            vendors = list(
+                filter(lambda v: _get_status(v).upper() == wanted_status, vendors)
+            )
 
         if category:
-            vendors = [
-                v for v in vendors if v.get("category", "").lower() == category.lower()
-            ]
+            wanted_category = category.lower()
+            vendors = list(
+                filter(
+                    lambda v: (_get_category(v) or "").lower() == wanted_category,
+                    vendors,
+                )
+            )
 
         # Apply pagination
         total_count = len(vendors)
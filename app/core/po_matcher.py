@@ -7,6 +7,8 @@ from typing import Optional, List, Dict, Any
 from decimal import Decimal
 import time
 
+from sqlalchemy.orm import Session
+
 from app.models.invoice import Invoice, InvoiceLineItem
 from app.models.purchase_order import PurchaseOrder, POLineItem
 from app.models.recommendation import (
@@ -26,7 +28,9 @@ class POMatcher:
         """Initialize the PO matcher"""
         self.po_service = po_service
 
-    def find_matching_po(self, invoice: Invoice) -> Optional[PurchaseOrder]:
+    def find_matching_po(
+        self, invoice: Invoice, db: Optional[Session] = None
+    ) -> Optional[PurchaseOrder]:
         """Find corresponding purchase order for invoice"""
         try:
             logger.info(f"Finding matching PO for invoice {invoice.invoice_number}")
@@ -37,22 +41,22 @@ class POMatcher:
 
             # Strategy 1: Direct PO reference
             if invoice.po_reference:
-                matching_po = self.po_service.get_po_by_number(invoice.po_reference)
+                matching_po = self.po_service.get_po_by_number(invoice.po_reference, db=db)
                 if matching_po:
                     logger.info(f"Found PO by direct reference: {invoice.po_reference}")
                     return matching_po
 
             # Strategy 2: Vendor + amount matching
             if not matching_po:
-                matching_po = self._find_po_by_vendor_and_amount(invoice)
+                matching_po = self._find_po_by_vendor_and_amount(invoice, db)
 
             # Strategy 3: Line item matching
             if not matching_po:
-                matching_po = self._find_po_by_line_items(invoice)
+                matching_po = self._find_po_by_line_items(invoice, db)
 
             # Strategy 4: Fuzzy vendor name matching
             if not matching_po:
-                matching_po = self._find_po_by_fuzzy_vendor(invoice)
+                matching_po = self._find_po_by_fuzzy_vendor(invoice, db)
 
             processing_time = (time.time() - start_time) * 1000
             logger.info(f"PO matching completed in {processing_time:.2f}ms")
@@ -64,12 +68,12 @@ class POMatcher:
             return None
 
     def _find_po_by_vendor_and_amount(
-        self, invoice: Invoice
+        self, invoice: Invoice, db: Optional[Session] = None
     ) -> Optional[PurchaseOrder]:
         """Find PO by vendor name and total amount"""
         try:
-            # Get POs for this vendor
-            vendor_pos = self.po_service.get_pos_by_vendor(invoice.vendor_name)
+            # Get POs for this vendor (every candidate, not just the first page)
+            vendor_pos = self.po_service.get_pos_by_vendor(invoice.vendor_name, limit=None, db=db)
 
             if not vendor_pos:
                 return None
@@ -87,11 +91,13 @@ class POMatcher:
             logger.error(f"Error in vendor/amount matching: {e}")
             return None
 
-    def _find_po_by_line_items(self, invoice: Invoice) -> Optional[PurchaseOrder]:
+    def _find_po_by_line_items(
+        self, invoice: Invoice, db: Optional[Session] = None
+    ) -> Optional[PurchaseOrder]:
         """Find PO by matching line items"""
         try:
-            # Get POs for this vendor
-            vendor_pos = self.po_service.get_pos_by_vendor(invoice.vendor_name)
+            # Get POs for this vendor (every candidate, not just the first page)
+            vendor_pos = self.po_service.get_pos_by_vendor(invoice.vendor_name, limit=None, db=db)
 
             if not vendor_pos:
                 return None
@@ -116,11 +122,14 @@ class POMatcher:
             logger.error(f"Error in line item matching: {e}")
             return None
 
-    def _find_po_by_fuzzy_vendor(self, invoice: Invoice) -> Optional[PurchaseOrder]:
+    def _find_po_by_fuzzy_vendor(
+        self, invoice: Invoice, db: Optional[Session] = None
+    ) -> Optional[PurchaseOrder]:
         """Find PO using fuzzy vendor name matching"""
         try:
-            # Get all POs and try fuzzy matching on vendor names
-            all_pos = self.po_service.get_all_pos()
+            # Stream all PO headers and try fuzzy matching on vendor names; only
+            # the winner needs its line items, so those are loaded afterwards
+            all_pos = self.po_service.iter_all_pos(db=db, with_line_items=False)
 
             best_match = None
             best_score = 0
@@ -137,8 +146,9 @@ class POMatcher:
                 logger.info(
                     f"Found PO by fuzzy vendor matching: {best_match.po_number} (score: {best_score:.2f})"
                 )
+                return self.po_service.get_po_by_number(best_match.po_number, db=db)
 
-            return best_match
+            return None
 
         except Exception as e:
             logger.error(f"Error in fuzzy vendor matching: {e}")
@@ -3,7 +3,7 @@ Database models for PRAT system
 """
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, String, Integer, Numeric, Date, TIMESTAMP, Text, ForeignKey, Index
+from sqlalchemy import Column, String, Integer, Numeric, Date, TIMESTAMP, Text, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -26,8 +26,8 @@ class PurchaseOrderDB(Base):
     status = Column(String(50), default="active")
     file_path = Column(Text)
     file_hash = Column(String(64), index=True)  # For detecting file changes
-    created_at = Column(TIMESTAMP)
-    updated_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     # Relationship to line items - temporarily commented out
     # line_items = relationship("POLineItemDB", back_populates="purchase_order", cascade="all, delete-orphan")
@@ -129,7 +129,11 @@ class ProcessingHistoryDB(Base):
 
 # Create indexes for better performance
 Index('idx_po_number', PurchaseOrderDB.po_number)
+Index('idx_po_number_upper', func.upper(PurchaseOrderDB.po_number))
 Index('idx_vendor_id', PurchaseOrderDB.vendor_id)
+Index('idx_po_total_amount', PurchaseOrderDB.total_amount)
+Index('idx_po_date', PurchaseOrderDB.po_date)
+Index('idx_po_status_amount', PurchaseOrderDB.status, PurchaseOrderDB.total_amount)
 Index('idx_po_line_items_po_id', POLineItemDB.po_id)
 Index('idx_invoice_number', InvoiceDB.invoice_number)
 Index('idx_invoice_vendor', InvoiceDB.vendor_name)
@@ -2,41 +2,101 @@
 Purchase Order Folder Monitoring Service
 """
 import os
+import uuid
+import time
+import queue
 import hashlib
 import logging
-from pathlib import Path
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from sqlalchemy.orm import Session
 
 from app.core.document_processor import DocumentProcessor
 from app.models.database_models import PurchaseOrderDB, POLineItemDB
+from app.services.po_service import invalidate_cached_pos
 
 logger = logging.getLogger(__name__)
 
+# Number of new POs persisted per transaction in batch processing
+PO_COMMIT_BATCH_SIZE = 50
+
+# Quiet period before a watched file is processed, collapses editor save bursts
+EVENT_DEBOUNCE_SECONDS = 0.2
+
+# File extensions treated as PO documents by the folder watcher
+_PO_EXTS = frozenset({'.pdf', '.png', '.jpg', '.jpeg'})
+
 class POFolderHandler(FileSystemEventHandler):
     """File system event handler for PO folder monitoring"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, document_processor: Optional[DocumentProcessor] = None):
+        # document_processor is only needed to process files; storing POs works without it
         self.db_session = db_session
-        self.document_processor = DocumentProcessor()
+        self.document_processor = document_processor
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
     
     def on_created(self, event):
         """Handle file creation events"""
         if not event.is_directory and self._is_po_file(event.src_path):
             logger.info(f"New PO file detected: {event.src_path}")
-            self.process_po_file(event.src_path)
+            self._enqueue(event.src_path)
     
     def on_modified(self, event):
         """Handle file modification events"""
         if not event.is_directory and self._is_po_file(event.src_path):
             logger.info(f"PO file modified: {event.src_path}")
-            self.process_po_file(event.src_path)
+            self._enqueue(event.src_path)
+    
+    def _enqueue(self, file_path: str):
+        """Hand a file off to the worker thread, keeping the observer thread free"""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="po-folder-worker", daemon=True)
+                self._worker.start()
+        self._queue.put(file_path)
+    
+    def _drain(self):
+        """Process queued files once their events have settled"""
+        deadlines: Dict[str, float] = {}
+        while True:
+            timeout = None
+            if deadlines:
+                timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+            
+            try:
+                file_path = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                if file_path is None:
+                    return
+                # Repeated events for the same file push its deadline back
+                deadlines[file_path] = time.monotonic() + EVENT_DEBOUNCE_SECONDS
+            
+            now = time.monotonic()
+            for ready_path in [p for p, deadline in deadlines.items() if deadline <= now]:
+                del deadlines[ready_path]
+                self.process_po_file(ready_path)
+    
+    def stop(self):
+        """Stop the worker thread"""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker:
+            self._queue.put(None)
+            worker.join()
     
     def _is_po_file(self, file_path: str) -> bool:
         """Check if file is a PO document"""
-        return file_path.lower().endswith(('.pdf', '.png', '.jpg', '.jpeg'))
+        # Only lowercase the extension, not the whole path
+        dot = file_path.rfind('.')
+        if dot < 0:
+            return False
+        return file_path[dot:].lower() in _PO_EXTS
     
     def process_po_file(self, file_path: str):
         """Process a single PO file and store in database"""
@@ -78,49 +138,112 @@ class POFolderHandler(FileSystemEventHandler):
             logger.error(f"Error generating file hash for {file_path}: {e}")
             return ""
     
+    def _store_po_data_nocommit(self, po_data: dict, file_path: str, file_hash: str) -> PurchaseOrderDB:
+        """Add extracted PO data to the session without committing"""
+        # Create PO record
+        po = PurchaseOrderDB(
+            id=uuid.uuid4(),  # Explicitly set the ID
+            po_number=po_data['po_number'],
+            vendor_name=po_data['vendor_name'],
+            vendor_id=po_data.get('vendor_id'),
+            total_amount=po_data.get('total_authorized', 0),  # LLM returns 'total_authorized'
+            po_date=po_data.get('po_date'),
+            file_path=file_path,
+            file_hash=file_hash
+        )
+        
+        # Flush the PO first so the line item foreign keys resolve
+        self.db_session.add(po)
+        self.db_session.flush()
+        
+        # Now add line items
+        for i, item_data in enumerate(po_data.get('line_items', [])):
+            line_item = POLineItemDB(
+                po_id=po.id,
+                line_number=i + 1,
+                description=item_data['description'],
+                quantity=item_data['quantity'],
+                unit_price=item_data['unit_price'],
+                total_amount=item_data.get('total_price', 0),  # LLM returns 'total_price'
+                product_code=item_data.get('sku'),  # Map SKU to product_code
+                category=item_data.get('part_number')  # Map part_number to category
+            )
+            self.db_session.add(line_item)
+        
+        return po
+    
     def _store_po_data(self, po_data: dict, file_path: str, file_hash: str):
         """Store extracted PO data in database"""
         try:
-            import uuid
-            
-            # Create PO record
-            po = PurchaseOrderDB(
-                id=uuid.uuid4(),  # Explicitly set the ID
-                po_number=po_data['po_number'],
-                vendor_name=po_data['vendor_name'],
-                vendor_id=po_data.get('vendor_id'),
-                total_amount=po_data.get('total_authorized', 0),  # LLM returns 'total_authorized'
-                po_date=po_data.get('po_date'),
-                file_path=file_path,
-                file_hash=file_hash
-            )
-            
-            # Add and commit PO first
-            self.db_session.add(po)
-            self.db_session.commit()
-            
-            # Now add line items
-            for i, item_data in enumerate(po_data.get('line_items', [])):
-                line_item = POLineItemDB(
-                    po_id=po.id,
-                    line_number=i + 1,
-                    description=item_data['description'],
-                    quantity=item_data['quantity'],
-                    unit_price=item_data['unit_price'],
-                    total_amount=item_data.get('total_price', 0),  # LLM returns 'total_price'
-                    product_code=item_data.get('sku'),  # Map SKU to product_code
-                    category=item_data.get('part_number')  # Map part_number to category
-                )
-                self.db_session.add(line_item)
-            
-            # Commit line items
+            po = self._store_po_data_nocommit(po_data, file_path, file_hash)
             self.db_session.commit()
+            invalidate_cached_pos(po.po_number)
             logger.info(f"Successfully stored PO {po.po_number} in database")
             
         except Exception as e:
             self.db_session.rollback()
             logger.error(f"Error storing PO data: {e}")
             raise
+    
+    def store_po_batch(self, pending: list, processed_files: list, skipped_files: list, errors: list):
+        """Persist a group of new POs in one transaction, retrying individually on failure
+
+        Each pending entry is (file_info, po_data, file_path, file_hash); outcomes are
+        appended to processed_files, skipped_files and errors.
+        """
+        try:
+            for file_info, po_data, file_path, file_hash in pending:
+                self._store_po_data_nocommit(po_data, file_path, file_hash)
+            self.db_session.commit()
+            invalidate_cached_pos(*(po_data['po_number'] for _, po_data, _, _ in pending))
+        except Exception as batch_error:
+            self.db_session.rollback()
+            logger.warning(f"Batch commit of {len(pending)} POs failed, retrying individually: {batch_error}")
+            for entry in pending:
+                self._store_pending_po(entry, processed_files, skipped_files, errors)
+            return
+        
+        for file_info, po_data, _, _ in pending:
+            processed_files.append({
+                "name": file_info["name"],
+                "status": "success",
+                "po_number": po_data.get('po_number'),
+                "vendor_name": po_data.get('vendor_name')
+            })
+            logger.info(f"Successfully processed new PO: {po_data.get('po_number')}")
+    
+    def _store_pending_po(self, entry: tuple, processed_files: list, skipped_files: list, errors: list):
+        """Store a single queued PO in its own transaction"""
+        file_info, po_data, file_path, file_hash = entry
+        try:
+            self._store_po_data(po_data, file_path, file_hash)
+            processed_files.append({
+                "name": file_info["name"],
+                "status": "success",
+                "po_number": po_data.get('po_number'),
+                "vendor_name": po_data.get('vendor_name')
+            })
+            logger.info(f"Successfully processed new PO: {po_data.get('po_number')}")
+        except Exception as store_error:
+            if "duplicate key" in str(store_error).lower() or "unique constraint" in str(store_error).lower():
+                # Handle race condition where PO was created between check and insert
+                skipped_files.append({
+                    "name": file_info["name"],
+                    "status": "skipped",
+                    "reason": f"PO {po_data.get('po_number')} was created by another process",
+                    "po_number": po_data.get('po_number'),
+                    "vendor_name": po_data.get('vendor_name')
+                })
+                logger.info(f"Skipping PO due to race condition: {po_data.get('po_number')}")
+            else:
+                # Other storage error
+                errors.append({
+                    "name": file_info["name"],
+                    "status": "error",
+                    "error": f"Database error: {str(store_error)}"
+                })
+                logger.error(f"Error storing PO {po_data.get('po_number')}: {store_error}")
+
 
 class POFolderService:
     """Service for managing PO folder monitoring"""
@@ -129,6 +252,8 @@ class POFolderService:
         self.observer = None
         self.handler = None
         self.is_monitoring = False
+        # Shared across handlers so the LLM client is only built once
+        self.document_processor = DocumentProcessor()
     
     def start_monitoring(self, db_session: Session, folder_path: str):
         """Start monitoring a folder for PO files"""
@@ -142,7 +267,7 @@ class POFolderService:
                 return
             
             # Create handler
-            self.handler = POFolderHandler(db_session)
+            self.handler = POFolderHandler(db_session, self.document_processor)
             
             # Create observer
             self.observer = Observer()
@@ -166,6 +291,9 @@ class POFolderService:
                 self.observer.join()
                 self.observer = None
             
+            if self.handler:
+                self.handler.stop()
+            
             self.is_monitoring = False
             logger.info("Stopped PO folder monitoring")
             
@@ -179,24 +307,8 @@ class POFolderService:
                 return {"error": f"Folder does not exist: {folder_path}"}
             
             # Get all files in folder with detailed information
-            files_info = []
-            total_size = 0
-            
-            for file_path in Path(folder_path).glob("*"):
-                if file_path.is_file():
-                    try:
-                        file_stat = file_path.stat()
-                        file_info = {
-                            "name": file_path.name,
-                            "size": file_stat.st_size,
-                            "modified": file_stat.st_mtime,
-                            "extension": file_path.suffix.lower(),
-                            "full_path": str(file_path)
-                        }
-                        files_info.append(file_info)
-                        total_size += file_stat.st_size
-                    except Exception as e:
-                        logger.error(f"Error getting file info for {file_path}: {e}")
+            files_info = self._list_files(folder_path)
+            total_size = sum(file_info["size"] for file_info in files_info)
             
             return {
                 "folder_path": folder_path,
@@ -209,6 +321,28 @@ class POFolderService:
             logger.error(f"Error scanning folder: {e}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _list_files(folder_path: str) -> list:
+        """Collect name, size and timestamps for the files directly inside a folder"""
+        files_info = []
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                try:
+                    # DirEntry answers is_file from the directory listing itself
+                    if not entry.is_file():
+                        continue
+                    file_stat = entry.stat()
+                    files_info.append({
+                        "name": entry.name,
+                        "size": file_stat.st_size,
+                        "modified": file_stat.st_mtime,
+                        "extension": os.path.splitext(entry.name)[1].lower(),
+                        "full_path": entry.path
+                    })
+                except OSError as e:
+                    logger.error(f"Error getting file info for {entry.path}: {e}")
+        return files_info
+    
     def get_monitoring_status(self) -> Dict[str, Any]:
         """Get current monitoring status"""
         return {
@@ -223,28 +357,14 @@ class POFolderService:
                 return {"error": f"Folder does not exist: {folder_path}"}
             
             # Create handler for processing
-            handler = POFolderHandler(db_session)
+            handler = POFolderHandler(db_session, self.document_processor)
             
             # Get all files in folder
-            files_info = []
+            files_info = self._list_files(folder_path)
             processed_files = []
             errors = []
             skipped_files = []
-            
-            for file_path in Path(folder_path).glob("*"):
-                if file_path.is_file():
-                    try:
-                        file_stat = file_path.stat()
-                        file_info = {
-                            "name": file_path.name,
-                            "size": file_stat.st_size,
-                            "modified": file_stat.st_mtime,
-                            "extension": file_path.suffix.lower(),
-                            "full_path": str(file_path)
-                        }
-                        files_info.append(file_info)
-                    except Exception as e:
-                        logger.error(f"Error getting file info for {file_path}: {e}")
+            pending = []
             
             # Process each file
             for file_info in files_info:
@@ -276,35 +396,11 @@ class POFolderService:
                                 })
                                 logger.info(f"Skipping existing PO: {po_data.get('po_number')}")
                             else:
-                                # New PO - process it
-                                try:
-                                    handler._store_po_data(po_data, file_path, handler._get_file_hash(file_path))
-                                    processed_files.append({
-                                        "name": file_info["name"],
-                                        "status": "success",
-                                        "po_number": po_data.get('po_number'),
-                                        "vendor_name": po_data.get('vendor_name')
-                                    })
-                                    logger.info(f"Successfully processed new PO: {po_data.get('po_number')}")
-                                except Exception as store_error:
-                                    if "duplicate key" in str(store_error).lower() or "unique constraint" in str(store_error).lower():
-                                        # Handle race condition where PO was created between check and insert
-                                        skipped_files.append({
-                                            "name": file_info["name"],
-                                            "status": "skipped",
-                                            "reason": f"PO {po_data.get('po_number')} was created by another process",
-                                            "po_number": po_data.get('po_number'),
-                                            "vendor_name": po_data.get('vendor_name')
-                                        })
-                                        logger.info(f"Skipping PO due to race condition: {po_data.get('po_number')}")
-                                    else:
-                                        # Other storage error
-                                        errors.append({
-                                            "name": file_info["name"],
-                                            "status": "error",
-                                            "error": f"Database error: {str(store_error)}"
-                                        })
-                                        logger.error(f"Error storing PO {po_data.get('po_number')}: {store_error}")
+                                # New PO - queue it for the next grouped commit
+                                pending.append((file_info, po_data, file_path, handler._get_file_hash(file_path)))
+                                if len(pending) >= PO_COMMIT_BATCH_SIZE:
+                                    handler.store_po_batch(pending, processed_files, skipped_files, errors)
+                                    pending = []
                         else:
                             errors.append({
                                 "name": file_info["name"],
@@ -325,6 +421,9 @@ class POFolderService:
                         "error": str(e)
                     })
             
+            if pending:
+                handler.store_po_batch(pending, processed_files, skipped_files, errors)
+            
             return {
                 "folder_path": folder_path,
                 "total_files": len(files_info),
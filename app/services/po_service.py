@@ -3,10 +3,20 @@ Purchase Order service for managing PO data
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+import uuid
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
 
+from cachetools import TTLCache
+from pydantic import TypeAdapter
+from sqlalchemy import Float, cast, event, func, insert, select, text
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.orm import Session
+
 from app.models.purchase_order import PurchaseOrder, POLineItem
 from app.models.database_models import PurchaseOrderDB, POLineItemDB
 from app.core.database import get_db_context
@@ -14,168 +24,310 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to build a PurchaseOrder; querying these instead of the
+# mapped class skips ORM instance hydration for read-only lookups
+_PO_COLUMNS = (
+    PurchaseOrderDB.id,
+    PurchaseOrderDB.po_number,
+    PurchaseOrderDB.vendor_name,
+    PurchaseOrderDB.vendor_id,
+    PurchaseOrderDB.total_amount,
+    PurchaseOrderDB.currency,
+    PurchaseOrderDB.po_date,
+    PurchaseOrderDB.status,
+)
+
+
+# PostgreSQL SQLSTATE for undefined_table
+_UNDEFINED_TABLE = "42P01"
+
+# Max PO ids per IN (...) list when loading line items
+_LINE_ITEM_IN_CHUNK = 500
+
+
+def _load_line_items(db: Session, po_ids: List[Any]) -> Dict[Any, List[POLineItem]]:
+    """Load line items for many POs with one IN query per chunk rather than one per PO"""
+    items_by_po: Dict[Any, List[POLineItem]] = defaultdict(list)
+    for start in range(0, len(po_ids), _LINE_ITEM_IN_CHUNK):
+        chunk = po_ids[start:start + _LINE_ITEM_IN_CHUNK]
+        rows = db.query(POLineItemDB).filter(
+            POLineItemDB.po_id.in_(chunk)
+        ).order_by(POLineItemDB.po_id, POLineItemDB.line_number).all()
+
+        for item in rows:
+            # Stored rows come from extraction and may not satisfy the
+            # quantity * unit_price check exactly, so skip re-validation
+            items_by_po[item.po_id].append(POLineItem.model_construct(
+                description=item.description or "",
+                quantity=int(item.quantity or 0),
+                unit_price=item.unit_price or Decimal("0"),
+                total_price=item.total_amount or Decimal("0"),
+                sku=item.product_code,
+                part_number=item.category,
+            ))
+    return items_by_po
+
+
+# PurchaseOrder field names that differ from their PurchaseOrderDB column
+_PO_UPDATE_COLUMNS = {"total_authorized": "total_amount"}
+
+# Columns update_po may write; anything else in the updates dict is ignored
+_PO_UPDATABLE_COLUMNS = frozenset({
+    "po_number",
+    "vendor_name",
+    "vendor_id",
+    "total_amount",
+    "currency",
+    "po_date",
+    "delivery_date",
+    "status",
+})
+
+# Rows fetched per round-trip when streaming every PO with iter_all_pos
+_STREAM_BATCH_SIZE = 1000
+
+# Bounds for the get_po_by_number cache; short TTL keeps out-of-band edits visible
+_PO_CACHE_MAXSIZE = 4096
+_PO_CACHE_TTL_SECONDS = 30
+
+# Recent PO lookups keyed by upper-cased PO number. Shared by every POService so a
+# write through any service or the folder watcher can invalidate it; TTLCache is
+# not thread-safe, so every access holds the lock
+_po_cache: TTLCache = TTLCache(maxsize=_PO_CACHE_MAXSIZE, ttl=_PO_CACHE_TTL_SECONDS)
+_po_cache_lock = threading.Lock()
+
+# Validates a whole batch of PO payloads in one call for create_pos_bulk
+_PO_LIST_ADAPTER = TypeAdapter(List[PurchaseOrder])
+
+
+def _po_to_rows(po: PurchaseOrder) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Map a PurchaseOrder onto insert mappings for purchase_orders and po_line_items"""
+    po_id = uuid.uuid4()
+    po_row = {
+        "id": po_id,
+        "po_number": po.po_number,
+        "vendor_name": po.vendor_name,
+        "vendor_id": po.vendor_id,
+        "total_amount": po.total_authorized,
+        "currency": po.currency,
+        "po_date": po.po_date,
+        "status": po.status,
+    }
+    item_rows = [
+        {
+            "id": uuid.uuid4(),
+            "po_id": po_id,
+            "line_number": line_number,
+            "description": item.description,
+            "quantity": item.quantity,
+            "unit_price": item.unit_price,
+            "total_amount": item.total_price,
+            "product_code": item.sku,
+            "category": item.part_number,
+        }
+        for line_number, item in enumerate(po.line_items, 1)
+    ]
+    return po_row, item_rows
+
+
+def _row_to_po(po_db, line_items: List[POLineItem]) -> PurchaseOrder:
+    """Convert a projected purchase_orders row into a PurchaseOrder"""
+    # Rows were validated on the way in, so skip re-validating them
+    return PurchaseOrder.model_construct(
+        po_number=po_db.po_number,
+        vendor_name=po_db.vendor_name,
+        vendor_id=po_db.vendor_id,
+        total_authorized=po_db.total_amount or Decimal("0"),
+        currency=po_db.currency,
+        po_date=po_db.po_date,
+        status=po_db.status,
+        line_items=line_items,
+    )
+
+
+def _rows_to_pos(db: Session, rows) -> List[PurchaseOrder]:
+    """Convert projected rows into PurchaseOrders, loading their line items in bulk"""
+    line_items = _load_line_items(db, [po_db.id for po_db in rows])
+    return [_row_to_po(po_db, line_items.get(po_db.id, [])) for po_db in rows]
+
+
+def invalidate_cached_pos(*po_numbers: str) -> None:
+    """Drop PO numbers from the shared get_po_by_number cache"""
+    with _po_cache_lock:
+        for po_number in po_numbers:
+            _po_cache.pop(po_number.upper(), None)
+
+
+def _invalidate_on_commit(db: Optional[Session], *po_numbers: str) -> None:
+    """Invalidate cached POs now and, for a caller's session, again once it commits"""
+    invalidate_cached_pos(*po_numbers)
+    if db is not None:
+        # A concurrent lookup may re-cache the old row before the caller commits
+        event.listen(db, "after_commit", lambda _: invalidate_cached_pos(*po_numbers), once=True)
+
+
+@contextmanager
+def _session_scope(db: Optional[Session]):
+    """Use the caller's session if given (caller commits), otherwise one committed session per call"""
+    if db is not None:
+        yield db
+    else:
+        with get_db_context() as own_db:
+            yield own_db
+
+
+def _paginate(query, limit: Optional[int], after_po_number: Optional[str]):
+    """Apply keyset pagination ordered by PO number (limit=None returns every row)"""
+    query = query.order_by(PurchaseOrderDB.po_number)
+    if after_po_number:
+        query = query.filter(PurchaseOrderDB.po_number > after_po_number)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
 
 class POService:
     """Service for managing purchase order data"""
 
     def __init__(self):
         """Initialize the PO service"""
+        # Whether the migration 005 summary tables exist; probed on first use
+        self._stats_cache_available: Optional[bool] = None
         logger.info("PO Service initialized with database storage")
 
-    def get_po_by_number(self, po_number: str) -> Optional[PurchaseOrder]:
+    def get_po_by_number(self, po_number: str, db: Optional[Session] = None) -> Optional[PurchaseOrder]:
         """Get purchase order by PO number"""
-        try:
-            with get_db_context() as db:
-                po_db = db.query(PurchaseOrderDB).filter_by(po_number=po_number).first()
-                
-                if po_db:
-                    logger.info(f"Found PO: {po_number}")
-                    # Convert database model to Pydantic model
-                    return PurchaseOrder(
-                        po_number=po_db.po_number,
-                        vendor_name=po_db.vendor_name,
-                        vendor_id=po_db.vendor_id,
-                        total_authorized=float(po_db.total_amount) if po_db.total_amount else 0.0,
-                        currency=po_db.currency,
-                        po_date=po_db.po_date,
-                        delivery_date=po_db.delivery_date,
-                        status=po_db.status,
-                        line_items=[]
-                    )
-                else:
-                    logger.info(f"PO not found: {po_number}")
-                    return None
-
-        except Exception as e:
-            logger.error(f"Error getting PO {po_number}: {e}")
-            return None
-
-    def get_pos_by_vendor(self, vendor_name: str) -> List[PurchaseOrder]:
-        """Get all purchase orders for a specific vendor"""
-        try:
-            logger.info(f"Looking up POs for vendor: {vendor_name}")
+        key = po_number.upper()
+        # A caller's session may see its own uncommitted writes, so only lookups
+        # on a fresh committed session read or fill the shared cache
+        use_cache = db is None
+        if use_cache:
+            with _po_cache_lock:
+                po = _po_cache.get(key)
+            if po is not None:
+                # Copies keep one caller's edits from leaking to every other caller
+                return po.model_copy(deep=True)
+
+        with _session_scope(db) as session:
+            # Case-insensitive match served by idx_po_number_upper
+            po_db = session.query(*_PO_COLUMNS).filter(
+                func.upper(PurchaseOrderDB.po_number) == key
+            ).first()
             
-            with get_db_context() as db:
-                vendor_pos_db = db.query(PurchaseOrderDB).filter(
-                    PurchaseOrderDB.vendor_name.ilike(f"%{vendor_name}%")
-                ).all()
-                
-                pos_list = []
-                for po_db in vendor_pos_db:
-                    po = PurchaseOrder(
-                        po_number=po_db.po_number,
-                        vendor_name=po_db.vendor_name,
-                        vendor_id=po_db.vendor_id,
-                        total_authorized=float(po_db.total_amount) if po_db.total_amount else 0.0,
-                        currency=po_db.currency,
-                        po_date=po_db.po_date,
-                        delivery_date=po_db.delivery_date,
-                        status=po_db.status,
-                        line_items=[]
-                    )
-                    pos_list.append(po)
-
-                logger.info(f"Found {len(pos_list)} POs for vendor {vendor_name}")
-                return pos_list
-
-        except Exception as e:
-            logger.error(f"Error getting POs for vendor {vendor_name}: {e}")
-            return []
-
-    def get_all_pos(self) -> List[PurchaseOrder]:
-        """Get all purchase orders"""
-        try:
-            with get_db_context() as db:
-                pos_db_list = db.query(PurchaseOrderDB).all()
-                
-                pos_list = []
-                for po_db in pos_db_list:
-                    po = PurchaseOrder(
-                        po_number=po_db.po_number,
-                        vendor_name=po_db.vendor_name,
-                        vendor_id=po_db.vendor_id,
-                        total_authorized=float(po_db.total_amount) if po_db.total_amount else 0.0,
-                        currency=po_db.currency,
-                        po_date=po_db.po_date,
-                        delivery_date=po_db.delivery_date,
-                        status=po_db.status,
-                        line_items=[]
-                    )
-                    pos_list.append(po)
-
-                logger.info(f"Retrieved {len(pos_list)} purchase orders")
-                return pos_list
-
-        except Exception as e:
-            logger.error(f"Error getting all POs: {e}")
-            return []
+            if po_db:
+                logger.info("Found PO: %s", po_number)
+                po = _row_to_po(po_db, _load_line_items(session, [po_db.id]).get(po_db.id, []))
+            else:
+                logger.info("PO not found: %s", po_number)
+                return None
 
-    def get_pos_by_status(self, status: str) -> List[PurchaseOrder]:
-        """Get purchase orders by status"""
-        try:
-            logger.info(f"Looking up POs with status: {status}")
+        if use_cache:
+            with _po_cache_lock:
+                _po_cache[key] = po.model_copy(deep=True)
+        return po
+
+    def get_pos_by_vendor(
+        self,
+        vendor_name: str,
+        limit: Optional[int] = 50,
+        after_po_number: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> List[PurchaseOrder]:
+        """Get a page of purchase orders for a specific vendor"""
+        logger.info("Looking up POs for vendor: %s", vendor_name)
+        
+        with _session_scope(db) as db:
+            query = db.query(*_PO_COLUMNS).filter(
+                PurchaseOrderDB.vendor_name.ilike(f"%{vendor_name}%")
+            )
+            vendor_pos_db = _paginate(query, limit, after_po_number).all()
             
-            with get_db_context() as db:
-                status_pos_db = db.query(PurchaseOrderDB).filter_by(status=status).all()
-                
-                pos_list = []
-                for po_db in status_pos_db:
-                    po = PurchaseOrder(
-                        po_number=po_db.po_number,
-                        vendor_name=po_db.vendor_name,
-                        vendor_id=po_db.vendor_id,
-                        total_authorized=float(po_db.total_amount) if po_db.total_amount else 0.0,
-                        currency=po_db.currency,
-                        po_date=po_db.po_date,
-                        delivery_date=po_db.delivery_date,
-                        status=po_db.status,
-                        line_items=[]
-                    )
-                    pos_list.append(po)
-
-                return pos_list
+            pos_list = _rows_to_pos(db, vendor_pos_db)
 
-        except Exception as e:
-            logger.error(f"Error getting POs by status {status}: {e}")
-            return []
+            logger.info("Found %d POs for vendor %s", len(pos_list), vendor_name)
+            return pos_list
 
-    def get_pos_by_amount_range(
-        self, min_amount: float, max_amount: float
+    def get_all_pos(
+        self,
+        limit: Optional[int] = 50,
+        after_po_number: Optional[str] = None,
+        db: Optional[Session] = None,
     ) -> List[PurchaseOrder]:
-        """Get purchase orders within an amount range"""
-        try:
-            logger.info(f"Looking up POs between ${min_amount} and ${max_amount}")
+        """Get a page of purchase orders"""
+        with _session_scope(db) as db:
+            query = db.query(*_PO_COLUMNS)
+            pos_db_list = _paginate(query, limit, after_po_number).all()
             
-            with get_db_context() as db:
-                pos_in_range_db = db.query(PurchaseOrderDB).filter(
-                    PurchaseOrderDB.total_amount.between(min_amount, max_amount)
-                ).all()
-                
-                pos_list = []
-                for po_db in pos_in_range_db:
-                    po = PurchaseOrder(
-                        po_number=po_db.po_number,
-                        vendor_name=po_db.vendor_name,
-                        vendor_id=po_db.vendor_id,
-                        total_authorized=float(po_db.total_amount) if po_db.total_amount else 0.0,
-                        currency=po_db.currency,
-                        po_date=po_db.po_date,
-                        delivery_date=po_db.delivery_date,
-                        status=po_db.status,
-                        line_items=[]
-                    )
-                    pos_list.append(po)
-
-                return pos_list
+            pos_list = _rows_to_pos(db, pos_db_list)
+
+            logger.info("Retrieved %d purchase orders", len(pos_list))
+            return pos_list
+
+    def iter_all_pos(
+        self,
+        batch_size: int = _STREAM_BATCH_SIZE,
+        db: Optional[Session] = None,
+        with_line_items: bool = True,
+    ) -> Iterator[PurchaseOrder]:
+        """Stream every purchase order in PO number order, holding one batch in memory at a time"""
+        with _session_scope(db) as db:
+            result = db.execute(
+                select(*_PO_COLUMNS)
+                .order_by(PurchaseOrderDB.po_number)
+                .execution_options(stream_results=True, yield_per=batch_size)
+            )
+            for batch in result.partitions():
+                if with_line_items:
+                    yield from _rows_to_pos(db, batch)
+                else:
+                    # Header-only POs skip the per-batch line item query
+                    yield from (_row_to_po(po_db, []) for po_db in batch)
+
+    def get_pos_by_status(
+        self,
+        status: str,
+        limit: Optional[int] = 50,
+        after_po_number: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> List[PurchaseOrder]:
+        """Get a page of purchase orders by status"""
+        logger.info("Looking up POs with status: %s", status)
+        
+        with _session_scope(db) as db:
+            query = db.query(*_PO_COLUMNS).filter(PurchaseOrderDB.status == status)
+            status_pos_db = _paginate(query, limit, after_po_number).all()
 
-        except Exception as e:
-            logger.error(f"Error getting POs by amount range: {e}")
-            return []
+            return _rows_to_pos(db, status_pos_db)
 
-    def create_po(self, po_data: Dict[str, Any]) -> Optional[PurchaseOrder]:
+    def get_pos_by_amount_range(
+        self,
+        min_amount: float,
+        max_amount: float,
+        status: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> List[PurchaseOrder]:
+        """Get purchase orders within an amount range, optionally limited to one status"""
+        logger.info("Looking up POs between $%s and $%s", min_amount, max_amount)
+        
+        with _session_scope(db) as db:
+            query = db.query(*_PO_COLUMNS).filter(
+                PurchaseOrderDB.total_amount.between(min_amount, max_amount)
+            )
+            if status:
+                # Equality on status plus the amount range is one scan of idx_po_status_amount
+                query = query.filter(PurchaseOrderDB.status == status)
+            pos_in_range_db = query.order_by(
+                PurchaseOrderDB.total_amount, PurchaseOrderDB.po_number
+            ).all()
+
+            return _rows_to_pos(db, pos_in_range_db)
+
+    def create_po(
+        self, po_data: Dict[str, Any], db: Optional[Session] = None
+    ) -> Optional[PurchaseOrder]:
         """Create a new purchase order"""
         try:
-            logger.info(f"Creating new PO: {po_data.get('po_number')}")
+            logger.info("Creating new PO: %s", po_data.get('po_number'))
 
             # Validate required fields
             required_fields = [
@@ -189,125 +341,195 @@ class POService:
                 if field not in po_data:
                     raise ValueError(f"Missing required field: {field}")
 
-            # Create PO object
-            po = PurchaseOrder(**po_data)
-
-            # Add to storage
-            self._pos[po.po_number.upper()] = po
+            created = self.create_pos_bulk([po_data], db=db)
+            if not created:
+                return None
 
-            logger.info(f"Successfully created PO: {po.po_number}")
+            po = created[0]
+            logger.info("Successfully created PO: %s", po.po_number)
             return po
 
         except Exception as e:
-            logger.error(f"Error creating PO: {e}")
+            logger.error("Error creating PO: %s", e)
             return None
 
-    def create_po_from_data(self, po_data: Dict[str, Any]) -> Optional[PurchaseOrder]:
+    def create_pos_bulk(
+        self, pos_data: List[Dict[str, Any]], db: Optional[Session] = None
+    ) -> List[PurchaseOrder]:
+        """Create many purchase orders with one multi-row INSERT per table in a single transaction"""
+        try:
+            logger.info("Creating %d POs in bulk", len(pos_data))
+            if not pos_data:
+                return []
+
+            pos = _PO_LIST_ADAPTER.validate_python(pos_data)
+
+            # created_at/updated_at come from the column server defaults and are
+            # read back with RETURNING, in parameter order so rows line up with pos
+            po_rows = []
+            item_rows = []
+            for po in pos:
+                po_row, po_item_rows = _po_to_rows(po)
+                po_rows.append(po_row)
+                item_rows.extend(po_item_rows)
+
+            with _session_scope(db) as session:
+                stamps = session.execute(
+                    insert(PurchaseOrderDB).returning(
+                        PurchaseOrderDB.created_at,
+                        PurchaseOrderDB.updated_at,
+                        sort_by_parameter_order=True,
+                    ),
+                    po_rows,
+                ).all()
+                if item_rows:
+                    session.execute(insert(POLineItemDB), item_rows)
+
+            for po, (created_at, updated_at) in zip(pos, stamps):
+                po.created_at = created_at
+                po.updated_at = updated_at
+
+            _invalidate_on_commit(db, *(po.po_number for po in pos))
+
+            logger.info("Successfully created %d POs in bulk", len(pos))
+            return pos
+
+        except Exception as e:
+            logger.error("Error creating POs in bulk: %s", e)
+            return []
+
+    def create_po_from_data(
+        self, po_data: Dict[str, Any], db: Optional[Session] = None
+    ) -> Optional[PurchaseOrder]:
         """Create a PO from extracted data (e.g., from PDF upload)"""
         try:
-            logger.info(f"Creating PO from extracted data: {po_data.get('po_number')}")
+            logger.info("Creating PO from extracted data: %s", po_data.get('po_number'))
 
             # Set default values for missing fields
             if 'status' not in po_data:
                 po_data['status'] = 'OPEN'
-            if 'created_at' not in po_data:
-                po_data['created_at'] = datetime.now()
-            if 'updated_at' not in po_data:
-                po_data['updated_at'] = datetime.now()
 
             # Create the PO
-            po = self.create_po(po_data)
+            po = self.create_po(po_data, db=db)
 
             if po:
-                logger.info(f"Successfully created PO from data: {po.po_number}")
+                logger.info("Successfully created PO from data: %s", po.po_number)
                 return po
             else:
                 logger.error("Failed to create PO from extracted data")
                 return None
 
         except Exception as e:
-            logger.error(f"Error creating PO from data: {e}")
+            logger.error("Error creating PO from data: %s", e)
             return None
 
     def update_po(
-        self, po_number: str, updates: Dict[str, Any]
+        self, po_number: str, updates: Dict[str, Any], db: Optional[Session] = None
     ) -> Optional[PurchaseOrder]:
         """Update an existing purchase order"""
         try:
-            logger.info(f"Updating PO: {po_number}")
+            logger.info("Updating PO: %s", po_number)
 
-            po = self.get_po_by_number(po_number)
-            if not po:
-                logger.warning(f"PO not found: {po_number}")
-                return None
+            with _session_scope(db) as session:
+                # Lock the row so the read and the write happen in one transaction
+                po_db = session.query(PurchaseOrderDB).filter(
+                    func.upper(PurchaseOrderDB.po_number) == po_number.upper()
+                ).with_for_update().first()
+
+                if not po_db:
+                    logger.warning("PO not found: %s", po_number)
+                    return None
+
+                # Update fields, mapping PurchaseOrder names onto DB columns
+                for key, value in updates.items():
+                    column = _PO_UPDATE_COLUMNS.get(key, key)
+                    if column in _PO_UPDATABLE_COLUMNS:
+                        setattr(po_db, column, value)
 
-            # Update fields
-            for key, value in updates.items():
-                if hasattr(po, key):
-                    setattr(po, key, value)
+                # updated_at is stamped by the column's onupdate=func.now()
+                session.flush()
 
-            # Update timestamp
-            po.updated_at = datetime.now()
+                po = _row_to_po(po_db, _load_line_items(session, [po_db.id]).get(po_db.id, []))
+                po.updated_at = po_db.updated_at
 
-            logger.info(f"Successfully updated PO: {po_number}")
+            _invalidate_on_commit(db, po_number, po.po_number)
+            logger.info("Successfully updated PO: %s", po_number)
             return po
 
         except Exception as e:
-            logger.error(f"Error updating PO {po_number}: {e}")
+            logger.error("Error updating PO %s: %s", po_number, e)
             return None
 
-    def delete_po(self, po_number: str) -> bool:
+    def delete_po(self, po_number: str, db: Optional[Session] = None) -> bool:
         """Delete a purchase order"""
         try:
-            logger.info(f"Deleting PO: {po_number}")
+            logger.info("Deleting PO: %s", po_number)
 
-            if po_number.upper() in self._pos:
-                del self._pos[po_number.upper()]
-                logger.info(f"Successfully deleted PO: {po_number}")
-                return True
-            else:
-                logger.warning(f"PO not found for deletion: {po_number}")
-                return False
+            with _session_scope(db) as session:
+                po_db = session.query(PurchaseOrderDB).filter(
+                    func.upper(PurchaseOrderDB.po_number) == po_number.upper()
+                ).first()
+
+                if not po_db:
+                    logger.warning("PO not found for deletion: %s", po_number)
+                    return False
+
+                session.query(POLineItemDB).filter(POLineItemDB.po_id == po_db.id).delete(
+                    synchronize_session=False
+                )
+                session.delete(po_db)
+
+            _invalidate_on_commit(db, po_number)
+            logger.info("Successfully deleted PO: %s", po_number)
+            return True
 
         except Exception as e:
-            logger.error(f"Error deleting PO {po_number}: {e}")
+            logger.error("Error deleting PO %s: %s", po_number, e)
             return False
 
-    def get_po_statistics(self) -> Dict[str, Any]:
+    def get_po_statistics(self, db: Optional[Session] = None) -> Dict[str, Any]:
         """Get statistics about purchase orders"""
         try:
-            total_pos = len(self._pos)
-            total_amount = sum(po.total_authorized for po in self._pos.values())
-
-            # Count by status
-            status_counts = {}
-            for po in self._pos.values():
-                status = po.status
-                status_counts[status] = status_counts.get(status, 0) + 1
+            with _session_scope(db) as db:
+                if self._stats_cache_available is not False:
+                    try:
+                        # Savepoint so a failed probe does not abort a caller's transaction
+                        with db.begin_nested():
+                            totals = self._read_cached_po_statistics(db)
+                        self._stats_cache_available = True
+                    except DBAPIError as e:
+                        # Summary tables only exist once migration 005 has run (PostgreSQL);
+                        # any other error falls back for this call and is probed again next time
+                        if (
+                            isinstance(e, ProgrammingError)
+                            and getattr(e.orig, "pgcode", None) == _UNDEFINED_TABLE
+                        ):
+                            self._stats_cache_available = False
+                        else:
+                            logger.warning("PO statistics cache unavailable, aggregating: %s", e)
+                        totals = self._aggregate_po_statistics(db)
+                else:
+                    totals = self._aggregate_po_statistics(db)
 
-            # Count by vendor
-            vendor_counts = {}
-            for po in self._pos.values():
-                vendor = po.vendor_name
-                vendor_counts[vendor] = vendor_counts.get(vendor, 0) + 1
+            total_pos, total_amount, status_counts, vendor_counts = totals
 
             # Average PO amount
-            avg_amount = total_amount / total_pos if total_pos > 0 else 0
+            avg_amount = total_amount / total_pos if total_pos > 0 else 0.0
 
             stats = {
                 "total_pos": total_pos,
-                "total_amount": float(total_amount),
-                "average_amount": float(avg_amount),
+                "total_amount": total_amount,
+                "average_amount": avg_amount,
                 "status_distribution": status_counts,
                 "vendor_distribution": vendor_counts,
                 "last_updated": datetime.now().isoformat()
             }
 
-            logger.info(f"Generated PO statistics: {total_pos} POs, ${total_amount} total")
+            logger.info("Generated PO statistics: %s POs, $%s total", total_pos, total_amount)
             return stats
 
         except Exception as e:
-            logger.error(f"Error generating PO statistics: {e}")
+            logger.error("Error generating PO statistics: %s", e)
             return {
                 "total_pos": 0,
                 "total_amount": 0.0,
@@ -318,21 +540,52 @@ class POService:
                 "error": str(e)
             }
 
-    def clear_all_pos(self) -> bool:
-        """Clear all purchase orders (useful for testing)"""
-        try:
-            count = len(self._pos)
-            self._pos.clear()
-            logger.info(f"Cleared {count} purchase orders")
-            return True
-        except Exception as e:
-            logger.error(f"Error clearing POs: {e}")
-            return False
-
-    def get_po_count(self) -> int:
+    def _read_cached_po_statistics(self, db: Session) -> Tuple[int, float, Dict[str, int], Dict[str, int]]:
+        """Read PO statistics from the trigger-maintained summary tables"""
+        status_rows = db.execute(text(
+            "SELECT status, cnt, CAST(total_amount AS DOUBLE PRECISION)"
+            " FROM po_status_counts WHERE cnt > 0"
+        )).all()
+        # Totals are summed from the handful of per-status rows
+        total_pos = sum(cnt for _, cnt, _ in status_rows)
+        total_amount = sum((amount for _, _, amount in status_rows), 0.0)
+        status_counts = {status: cnt for status, cnt, _ in status_rows}
+        vendor_counts = dict(db.execute(
+            text("SELECT vendor, cnt FROM po_vendor_counts WHERE cnt > 0")
+        ).all())
+        return total_pos, total_amount, status_counts, vendor_counts
+
+    def _aggregate_po_statistics(self, db: Session) -> Tuple[int, float, Dict[str, int], Dict[str, int]]:
+        """Compute PO statistics from one GROUP BY (status, vendor) query"""
+        # Group keys match the summary tables, which store NULL as 'Unknown'
+        status_key = func.coalesce(PurchaseOrderDB.status, "Unknown")
+        vendor_key = func.coalesce(PurchaseOrderDB.vendor_name, "Unknown")
+        rows = db.query(
+            status_key,
+            vendor_key,
+            func.count(PurchaseOrderDB.id),
+            # Cast in SQL so the driver hands back a float, not a Decimal
+            func.coalesce(cast(func.sum(PurchaseOrderDB.total_amount), Float), 0.0),
+        ).group_by(status_key, vendor_key).all()
+
+        # One pass over the (status, vendor) groups, which are far fewer than POs
+        total_pos = 0
+        total_amount = 0.0
+        status_counts: Dict[str, int] = defaultdict(int)
+        vendor_counts: Dict[str, int] = defaultdict(int)
+        for status, vendor, count, amount in rows:
+            total_pos += count
+            total_amount += amount
+            status_counts[status] += count
+            vendor_counts[vendor] += count
+        return total_pos, total_amount, dict(status_counts), dict(vendor_counts)
+
+    def get_po_count(self, db: Optional[Session] = None) -> int:
         """Get the total number of purchase orders"""
-        return len(self._pos)
+        with _session_scope(db) as db:
+            return db.query(func.count(PurchaseOrderDB.id)).scalar()
 
-    def is_empty(self) -> bool:
+    def is_empty(self, db: Optional[Session] = None) -> bool:
         """Check if there are no purchase orders"""
-        return len(self._pos) == 0
+        with _session_scope(db) as db:
+            return not db.query(db.query(PurchaseOrderDB.id).exists()).scalar()
@@ -3,12 +3,147 @@ Vendor service for managing vendor data and validation
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, replace
+from typing import List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class Vendor:
+    """In-memory vendor record"""
+
+    vendor_id: str
+    name: str
+    status: str
+    authorized: bool
+    category: Optional[str] = None
+    payment_terms: Optional[str] = None
+    invoice_limit: Optional[float] = None
+    contracts: List[Dict[str, Any]] = field(default_factory=list)
+    contact_info: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+_VENDOR_FIELDS = frozenset(f.name for f in fields(Vendor))
+
+# Shared values for the sample vendors, so every record references one object.
+# Rows are passed positionally to Vendor; their nested contracts/contact_info are
+# deep-copied per VendorService so in-place edits never reach other instances
+_STATUS_ACTIVE = "ACTIVE"
+_STATUS_INACTIVE = "INACTIVE"
+_NET_30 = "Net 30"
+_NET_15 = "Net 15"
+_OFFICE_SUPPLIES = "Office Supplies"
+_SAMPLE_DATE = datetime(2024, 1, 1)
+
+_SAMPLE_VENDOR_ROWS = (
+    (
+        "VEND-001",
+        "ABC Supplies Inc.",
+        _STATUS_ACTIVE,
+        True,
+        _OFFICE_SUPPLIES,
+        _NET_30,
+        10000.00,
+        (
+            {
+                "contract_id": "CONTRACT-2024-001",
+                "start_date": "2024-01-01",
+                "end_date": "2024-12-31",
+                "status": _STATUS_ACTIVE,
+            },
+        ),
+        {
+            "email": "orders@abcsupplies.com",
+            "phone": "555-123-4567",
+            "address": "123 Main St, Anytown, USA",
+        },
+        _SAMPLE_DATE,
+        _SAMPLE_DATE,
+    ),
+    (
+        "VEND-002",
+        "Tech Solutions LLC",
+        _STATUS_ACTIVE,
+        True,
+        "Technology",
+        _NET_30,
+        50000.00,
+        (
+            {
+                "contract_id": "CONTRACT-2024-002",
+                "start_date": "2024-01-01",
+                "end_date": "2024-12-31",
+                "status": _STATUS_ACTIVE,
+            },
+        ),
+        {
+            "email": "sales@techsolutions.com",
+            "phone": "555-987-6543",
+            "address": "456 Tech Ave, Tech City, USA",
+        },
+        _SAMPLE_DATE,
+        _SAMPLE_DATE,
+    ),
+    (
+        "VEND-003",
+        "Office Depot",
+        _STATUS_ACTIVE,
+        True,
+        _OFFICE_SUPPLIES,
+        _NET_15,
+        5000.00,
+        (),
+        {
+            "email": "corporate@officedepot.com",
+            "phone": "555-555-5555",
+            "address": "789 Office Blvd, Office City, USA",
+        },
+        _SAMPLE_DATE,
+        _SAMPLE_DATE,
+    ),
+    (
+        "VEND-004",
+        "Old Supplier Corp",
+        _STATUS_INACTIVE,
+        False,
+        "General",
+        _NET_30,
+        1000.00,
+        (),
+        {
+            "email": "info@oldsupplier.com",
+            "phone": "555-111-2222",
+            "address": "999 Old St, Old Town, USA",
+        },
+        datetime(2023, 1, 1),
+        datetime(2023, 12, 31),
+    ),
+)
+
+# Fixed validate_vendor_invoice outcomes; returned as copies so callers may extend them
+_VENDOR_NOT_FOUND_RESULT = {
+    "valid": False,
+    "reason": "Vendor not found",
+    "severity": "HIGH",
+}
+_VENDOR_NOT_AUTHORIZED_RESULT = {
+    "valid": False,
+    "reason": "Vendor is not authorized",
+    "severity": "CRITICAL",
+}
+_VENDOR_VALID_RESULT = {
+    "valid": True,
+    "reason": "Vendor validation passed",
+    "severity": "LOW",
+}
+
+
 class VendorService:
     """Service for managing vendor data and validation"""
 
@@ -18,137 +153,149 @@ class VendorService:
         # For now, we'll use in-memory storage with sample data
         self._vendors = self._load_sample_vendors()
 
-    def get_vendor_by_id(self, vendor_id: str) -> Optional[Dict[str, Any]]:
+        # Secondary indexes, kept in step with self._vendors by _index_vendor/_unindex_vendor
+        self._name_index: Dict[str, Vendor] = {}
+        self._active_vendors: Dict[str, Vendor] = {}
+        self._authorized_ids: Set[str] = set()
+        # Lower-cased names of vendors that are both ACTIVE and authorized
+        self._authorized_active_names: Set[str] = set()
+        # Running per-status/per-category vendor counts for get_vendor_statistics
+        self._status_counts: Counter = Counter()
+        self._category_counts: Counter = Counter()
+        for key, vendor in self._vendors.items():
+            self._index_vendor(key, vendor)
+
+    @staticmethod
+    def _index_keys(vendor: Vendor) -> Tuple[str, str, str]:
+        """Name, status and category keys a vendor is indexed under"""
+        keys = (vendor.name.lower(), vendor.status, vendor.category or "Unknown")
+        # Fail here, before any index is touched, if a value cannot be indexed
+        hash(keys)
+        return keys
+
+    def _index_vendor(self, key: str, vendor: Vendor):
+        """Add a vendor to the name, active and authorized indexes"""
+        name_key, status, category = self._index_keys(vendor)
+        self._name_index[name_key] = vendor
+        if vendor.status == _STATUS_ACTIVE:
+            self._active_vendors[key] = vendor
+        if vendor.authorized:
+            self._authorized_ids.add(key)
+        if vendor.status == _STATUS_ACTIVE and vendor.authorized:
+            self._authorized_active_names.add(name_key)
+        else:
+            self._authorized_active_names.discard(name_key)
+        self._status_counts[status] += 1
+        self._category_counts[category] += 1
+
+    def _unindex_vendor(self, key: str, vendor: Vendor):
+        """Remove a vendor from the name, active and authorized indexes"""
+        name_key, status, category = self._index_keys(vendor)
+        if self._name_index.get(name_key) is vendor:
+            del self._name_index[name_key]
+            self._authorized_active_names.discard(name_key)
+        self._active_vendors.pop(key, None)
+        self._authorized_ids.discard(key)
+        for counts, bucket in (
+            (self._status_counts, status),
+            (self._category_counts, category),
+        ):
+            counts[bucket] -= 1
+            if counts[bucket] <= 0:
+                del counts[bucket]
+
+    def get_vendor_by_id(self, vendor_id: str) -> Optional[Vendor]:
         """Get vendor by ID"""
-        try:
-            logger.info(f"Looking up vendor: {vendor_id}")
-            return self._vendors.get(vendor_id.upper())
-        except Exception as e:
-            logger.error(f"Error getting vendor {vendor_id}: {e}")
-            return None
+        logger.info("Looking up vendor: %s", vendor_id)
+        return self._vendors.get(vendor_id.upper())
 
-    def get_vendor_by_name(self, vendor_name: str) -> Optional[Dict[str, Any]]:
+    def get_vendor_by_name(self, vendor_name: str) -> Optional[Vendor]:
         """Get vendor by name"""
-        try:
-            logger.info(f"Looking up vendor by name: {vendor_name}")
-            vendor_lower = vendor_name.lower()
-
-            for vendor in self._vendors.values():
-                if vendor["name"].lower() == vendor_lower:
-                    return vendor
-
-            return None
-        except Exception as e:
-            logger.error(f"Error getting vendor by name {vendor_name}: {e}")
-            return None
+        logger.info("Looking up vendor by name: %s", vendor_name)
+        return self._name_index.get(vendor_name.lower())
 
-    def get_all_vendors(self) -> List[Dict[str, Any]]:
+    def get_all_vendors(self) -> List[Vendor]:
         """Get all vendors"""
-        try:
-            return list(self._vendors.values())
-        except Exception as e:
-            logger.error(f"Error getting all vendors: {e}")
-            return []
+        return list(self._vendors.values())
 
-    def get_active_vendors(self) -> List[Dict[str, Any]]:
+    def get_active_vendors(self) -> List[Vendor]:
         """Get all active vendors"""
-        try:
-            return [
-                vendor
-                for vendor in self._vendors.values()
-                if vendor["status"] == "ACTIVE"
-            ]
-        except Exception as e:
-            logger.error(f"Error getting active vendors: {e}")
-            return []
+        return list(self._active_vendors.values())
 
     def is_vendor_authorized(self, vendor_name: str) -> bool:
         """Check if vendor is authorized"""
         try:
-            vendor = self.get_vendor_by_name(vendor_name)
-            if vendor:
-                return vendor["status"] == "ACTIVE" and vendor["authorized"]
-            return False
+            return vendor_name.lower() in self._authorized_active_names
         except Exception as e:
-            logger.error(f"Error checking vendor authorization: {e}")
+            logger.error("Error checking vendor authorization: %s", e)
             return False
 
     def get_vendor_contracts(self, vendor_id: str) -> List[Dict[str, Any]]:
         """Get contracts for a vendor"""
-        try:
-            vendor = self.get_vendor_by_id(vendor_id)
-            if vendor:
-                return vendor.get("contracts", [])
-            return []
-        except Exception as e:
-            logger.error(f"Error getting vendor contracts: {e}")
-            return []
+        vendor = self.get_vendor_by_id(vendor_id)
+        if vendor:
+            return list(vendor.contracts)
+        return []
 
     def validate_vendor_invoice(
         self, vendor_name: str, invoice_amount: float
     ) -> Dict[str, Any]:
         """Validate vendor invoice against vendor rules"""
         try:
-            logger.info(f"Validating invoice for vendor: {vendor_name}")
+            logger.info("Validating invoice for vendor: %s", vendor_name)
 
-            vendor = self.get_vendor_by_name(vendor_name)
+            vendor = self._name_index.get(vendor_name.lower())
             if not vendor:
-                return {
-                    "valid": False,
-                    "reason": "Vendor not found",
-                    "severity": "HIGH",
-                }
+                return dict(_VENDOR_NOT_FOUND_RESULT)
+
+            status, authorized, limit = (
+                vendor.status,
+                vendor.authorized,
+                vendor.invoice_limit,
+            )
 
             # Check if vendor is active
-            if vendor["status"] != "ACTIVE":
+            if status != _STATUS_ACTIVE:
                 return {
                     "valid": False,
-                    "reason": f"Vendor status is {vendor['status']}",
+                    "reason": f"Vendor status is {status}",
                     "severity": "HIGH",
                 }
 
             # Check if vendor is authorized
-            if not vendor["authorized"]:
-                return {
-                    "valid": False,
-                    "reason": "Vendor is not authorized",
-                    "severity": "CRITICAL",
-                }
+            if not authorized:
+                return dict(_VENDOR_NOT_AUTHORIZED_RESULT)
 
             # Check invoice limit
-            if "invoice_limit" in vendor and invoice_amount > vendor["invoice_limit"]:
+            if limit is not None and invoice_amount > limit:
                 return {
                     "valid": False,
-                    "reason": f"Invoice amount ${invoice_amount} exceeds vendor limit ${vendor['invoice_limit']}",
+                    "reason": f"Invoice amount ${invoice_amount} exceeds vendor limit ${limit}",
                     "severity": "HIGH",
                 }
 
             # Check payment terms
-            if "payment_terms" in vendor:
+            if vendor.payment_terms is not None:
                 return {
                     "valid": True,
-                    "payment_terms": vendor["payment_terms"],
+                    "payment_terms": vendor.payment_terms,
                     "severity": "LOW",
                 }
 
-            return {
-                "valid": True,
-                "reason": "Vendor validation passed",
-                "severity": "LOW",
-            }
+            return dict(_VENDOR_VALID_RESULT)
 
         except Exception as e:
-            logger.error(f"Error validating vendor invoice: {e}")
+            logger.error("Error validating vendor invoice: %s", e)
             return {
                 "valid": False,
                 "reason": f"Validation error: {str(e)}",
                 "severity": "HIGH",
             }
 
-    def create_vendor(self, vendor_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def create_vendor(self, vendor_data: Dict[str, Any]) -> Optional[Vendor]:
         """Create a new vendor"""
         try:
-            logger.info(f"Creating new vendor: {vendor_data.get('name')}")
+            logger.info("Creating new vendor: %s", vendor_data.get('name'))
 
             # Validate required fields
             required_fields = ["vendor_id", "name", "status", "authorized"]
@@ -156,179 +303,92 @@ class VendorService:
                 if field not in vendor_data:
                     raise ValueError(f"Missing required field: {field}")
 
-            # Add creation timestamp
-            vendor_data["created_at"] = datetime.now()
-            vendor_data["updated_at"] = datetime.now()
-
-            # Add to storage
-            self._vendors[vendor_data["vendor_id"].upper()] = vendor_data
+            # Keep only known vendor fields; None values fall back to the field defaults
+            vendor = Vendor(**{
+                key: value
+                for key, value in vendor_data.items()
+                if key in _VENDOR_FIELDS and value is not None
+            })
 
-            logger.info(f"Successfully created vendor: {vendor_data['vendor_id']}")
-            return vendor_data
+            # Add creation timestamp
+            vendor.created_at = datetime.now()
+            vendor.updated_at = vendor.created_at
+
+            # Add to storage, replacing any existing vendor with this ID
+            self._index_keys(vendor)
+            key = vendor.vendor_id.upper()
+            existing = self._vendors.get(key)
+            if existing:
+                self._unindex_vendor(key, existing)
+            self._vendors[key] = vendor
+            self._index_vendor(key, vendor)
+
+            logger.info("Successfully created vendor: %s", vendor.vendor_id)
+            return vendor
 
         except Exception as e:
-            logger.error(f"Error creating vendor: {e}")
+            logger.error("Error creating vendor: %s", e)
             return None
 
     def update_vendor(
         self, vendor_id: str, updates: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[Vendor]:
         """Update an existing vendor"""
         try:
-            logger.info(f"Updating vendor: {vendor_id}")
+            logger.info("Updating vendor: %s", vendor_id)
 
-            vendor = self.get_vendor_by_id(vendor_id)
+            vendor_key = vendor_id.upper()
+            vendor = self._vendors.get(vendor_key)
             if not vendor:
-                logger.warning(f"Vendor not found: {vendor_id}")
+                logger.warning("Vendor not found: %s", vendor_id)
                 return None
 
-            # Update fields
-            for key, value in updates.items():
-                if key in vendor:
-                    vendor[key] = value
+            # Update fields, checking first that the result can be indexed so a
+            # bad value fails before the vendor is taken out of the indexes
+            changes = {key: value for key, value in updates.items() if key in _VENDOR_FIELDS}
+            self._index_keys(replace(vendor, **changes))
+
+            # Re-index around the update in case name, status or authorized change
+            self._unindex_vendor(vendor_key, vendor)
+            for key, value in changes.items():
+                setattr(vendor, key, value)
 
             # Update timestamp
-            vendor["updated_at"] = datetime.now()
+            vendor.updated_at = datetime.now()
+
+            self._index_vendor(vendor_key, vendor)
 
-            logger.info(f"Successfully updated vendor: {vendor_id}")
+            logger.info("Successfully updated vendor: %s", vendor_id)
             return vendor
 
         except Exception as e:
-            logger.error(f"Error updating vendor {vendor_id}: {e}")
+            logger.error("Error updating vendor %s: %s", vendor_id, e)
             return None
 
     def get_vendor_statistics(self) -> Dict[str, Any]:
         """Get statistics about vendors"""
         try:
-            total_vendors = len(self._vendors)
-            active_vendors = len(
-                [v for v in self._vendors.values() if v["status"] == "ACTIVE"]
-            )
-            authorized_vendors = len(
-                [v for v in self._vendors.values() if v["authorized"]]
-            )
-
-            # Count by status
-            status_counts = {}
-            for vendor in self._vendors.values():
-                status = vendor["status"]
-                status_counts[status] = status_counts.get(status, 0) + 1
-
-            # Count by category
-            category_counts = {}
-            for vendor in self._vendors.values():
-                category = vendor.get("category", "Unknown")
-                category_counts[category] = category_counts.get(category, 0) + 1
-
+            # Counts are maintained incrementally by _index_vendor/_unindex_vendor
             return {
-                "total_vendors": total_vendors,
-                "active_vendors": active_vendors,
-                "authorized_vendors": authorized_vendors,
-                "status_counts": status_counts,
-                "category_counts": category_counts,
+                "total_vendors": len(self._vendors),
+                "active_vendors": len(self._active_vendors),
+                "authorized_vendors": len(self._authorized_ids),
+                "status_counts": dict(self._status_counts),
+                "category_counts": dict(self._category_counts),
             }
 
         except Exception as e:
-            logger.error(f"Error getting vendor statistics: {e}")
+            logger.error("Error getting vendor statistics: %s", e)
             return {}
 
-    def _load_sample_vendors(self) -> Dict[str, Dict[str, Any]]:
+    def _load_sample_vendors(self) -> Dict[str, Vendor]:
         """Load sample vendor data"""
         sample_vendors = {}
+        for row in _SAMPLE_VENDOR_ROWS:
+            vendor = Vendor(*row)
+            vendor.contracts = deepcopy(list(vendor.contracts))
+            vendor.contact_info = deepcopy(vendor.contact_info)
+            sample_vendors[vendor.vendor_id] = vendor
 
-        # Sample vendor 1
-        vendor1 = {
-            "vendor_id": "VEND-001",
-            "name": "ABC Supplies Inc.",
-            "status": "ACTIVE",
-            "authorized": True,
-            "category": "Office Supplies",
-            "payment_terms": "Net 30",
-            "invoice_limit": 10000.00,
-            "contracts": [
-                {
-                    "contract_id": "CONTRACT-2024-001",
-                    "start_date": "2024-01-01",
-                    "end_date": "2024-12-31",
-                    "status": "ACTIVE",
-                }
-            ],
-            "contact_info": {
-                "email": "orders@abcsupplies.com",
-                "phone": "555-123-4567",
-                "address": "123 Main St, Anytown, USA",
-            },
-            "created_at": datetime(2024, 1, 1),
-            "updated_at": datetime(2024, 1, 1),
-        }
-        sample_vendors["VEND-001"] = vendor1
-
-        # Sample vendor 2
-        vendor2 = {
-            "vendor_id": "VEND-002",
-            "name": "Tech Solutions LLC",
-            "status": "ACTIVE",
-            "authorized": True,
-            "category": "Technology",
-            "payment_terms": "Net 30",
-            "invoice_limit": 50000.00,
-            "contracts": [
-                {
-                    "contract_id": "CONTRACT-2024-002",
-                    "start_date": "2024-01-01",
-                    "end_date": "2024-12-31",
-                    "status": "ACTIVE",
-                }
-            ],
-            "contact_info": {
-                "email": "sales@techsolutions.com",
-                "phone": "555-987-6543",
-                "address": "456 Tech Ave, Tech City, USA",
-            },
-            "created_at": datetime(2024, 1, 1),
-            "updated_at": datetime(2024, 1, 1),
-        }
-        sample_vendors["VEND-002"] = vendor2
-
-        # Sample vendor 3
-        vendor3 = {
-            "vendor_id": "VEND-003",
-            "name": "Office Depot",
-            "status": "ACTIVE",
-            "authorized": True,
-            "category": "Office Supplies",
-            "payment_terms": "Net 15",
-            "invoice_limit": 5000.00,
-            "contracts": [],
-            "contact_info": {
-                "email": "corporate@officedepot.com",
-                "phone": "555-555-5555",
-                "address": "789 Office Blvd, Office City, USA",
-            },
-            "created_at": datetime(2024, 1, 1),
-            "updated_at": datetime(2024, 1, 1),
-        }
-        sample_vendors["VEND-003"] = vendor3
-
-        # Sample vendor 4 (inactive)
-        vendor4 = {
-            "vendor_id": "VEND-004",
-            "name": "Old Supplier Corp",
-            "status": "INACTIVE",
-            "authorized": False,
-            "category": "General",
-            "payment_terms": "Net 30",
-            "invoice_limit": 1000.00,
-            "contracts": [],
-            "contact_info": {
-                "email": "info@oldsupplier.com",
-                "phone": "555-111-2222",
-                "address": "999 Old St, Old Town, USA",
-            },
-            "created_at": datetime(2023, 1, 1),
-            "updated_at": datetime(2023, 12, 31),
-        }
-        sample_vendors["VEND-004"] = vendor4
-
-        logger.info(f"Loaded {len(sample_vendors)} sample vendors")
+        logger.info("Loaded %d sample vendors", len(sample_vendors))
         return sample_vendors
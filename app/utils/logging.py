@@ -2,16 +2,35 @@
 Logging configuration for the PRAT application
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
 
 from app.config import settings
 
+DETAILED_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+)
+SIMPLE_FORMATTER = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+# Background listener that owns the real handlers, and the root handler feeding
+# it; see setup_logging/stop_logging
+_queue_listener = None
+_queue_handler = None
+
 
 def setup_logging():
     """Setup application logging configuration"""
+    global _queue_listener, _queue_handler
+
+    # Already configured (e.g. imported by several entry points); keep the running setup
+    if _queue_listener is not None:
+        return
+
+    log_level = getattr(logging, settings.log_level.upper())
 
     # Create logs directory if it doesn't exist
     log_dir = Path(settings.log_file).parent
@@ -19,31 +38,31 @@ def setup_logging():
 
     # Configure root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.log_level.upper()))
+    root_logger.setLevel(log_level)
 
     # Clear existing handlers
     root_logger.handlers.clear()
 
-    # Create formatters
-    detailed_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
-    )
-
-    simple_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(SIMPLE_FORMATTER)
 
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
         settings.log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
     )
-    file_handler.setLevel(getattr(logging, settings.log_level.upper()))
-    file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
+    file_handler.setLevel(log_level)
+    file_handler.setFormatter(DETAILED_FORMATTER)
+
+    # Log calls only enqueue records; a listener thread does the console/file I/O
+    log_queue = queue.Queue(-1)
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -53,8 +72,27 @@ def setup_logging():
     # Log startup message
     logger = logging.getLogger(__name__)
     logger.info("Logging configuration initialized")
-    logger.info(f"Log level: {settings.log_level}")
-    logger.info(f"Log file: {settings.log_file}")
+    logger.info("Log level: %s", settings.log_level)
+    logger.info("Log file: %s", settings.log_file)
+
+
+def stop_logging():
+    """Stop the logging listener thread, flushing any queued records"""
+    global _queue_listener, _queue_handler
+    if _queue_listener is not None:
+        root_logger = logging.getLogger()
+        # Detach the queue first so nothing is enqueued once the listener stops draining it
+        root_logger.removeHandler(_queue_handler)
+        _queue_listener.stop()
+        # Log directly to the console/file handlers from here on;
+        # logging.shutdown closes them at exit
+        for handler in _queue_listener.handlers:
+            root_logger.addHandler(handler)
+        _queue_listener = None
+        _queue_handler = None
+
+
+atexit.register(stop_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
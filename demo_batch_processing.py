@@ -9,130 +9,149 @@ import asyncio
 import httpx
 from pathlib import Path
 
-async def demo_batch_processing():
-    """Demonstrate the batch processing functionality"""
-    
-    base_url = "http://localhost:8000"
-    
-    print("PRAT Batch Processing Demo")
-    print("=" * 50)
-    print()
-    
-    # Check if the application is running
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/health")
-            if response.status_code != 200:
-                print("❌ Application is not responding properly")
-                return
-    except httpx.ConnectError:
-        print("❌ Cannot connect to PRAT application")
-        print("   Make sure the application is running on http://localhost:8000")
-        print("   Run: python start_app.py")
-        return
-    
-    print("✅ Connected to PRAT application")
-    print()
-    
-    # Demo 1: Create required folders
-    print("1. Creating required folders...")
+async def step_create_folders(client):
+    """Demo 1: Create required folders; returns the lines to print"""
+    lines = ["1. Creating required folders..."]
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{base_url}/api/v1/folder-monitoring/create-folders")
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   ✅ Folders created: {result.get('folders_created', [])}")
-            else:
-                print(f"   ⚠️  Folder creation response: {response.status_code}")
+        response = await client.post("/api/v1/folder-monitoring/create-folders")
+        if response.status_code == 200:
+            result = response.json()
+            lines.append(f"   ✅ Folders created: {result.get('folders_created', [])}")
+        else:
+            lines.append(f"   ⚠️  Folder creation response: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Error creating folders: {e}")
-    
-    print()
-    
-    # Demo 2: Get system status
-    print("2. Getting system status...")
+        lines.append(f"   ❌ Error creating folders: {e}")
+    return lines
+
+
+async def step_status(client):
+    """Demo 2: Get system status; returns the lines to print"""
+    lines = ["2. Getting system status..."]
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/api/v1/folder-monitoring/status")
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   ✅ Monitoring status: {result.get('monitoring_status', 'Unknown')}")
-                print(f"   ✅ Configured PO folder: {result.get('configured_folder', 'Unknown')}")
-            else:
-                print(f"   ❌ Status check failed: {response.status_code}")
+        response = await client.get("/api/v1/folder-monitoring/status")
+        if response.status_code == 200:
+            result = response.json()
+            lines.append(f"   ✅ Monitoring status: {result.get('monitoring_status', 'Unknown')}")
+            lines.append(f"   ✅ Configured PO folder: {result.get('configured_folder', 'Unknown')}")
+        else:
+            lines.append(f"   ❌ Status check failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Error getting status: {e}")
-    
-    print()
-    
-    # Demo 3: Scan sample data folder
-    print("3. Scanning sample data folder...")
-    sample_folder = os.path.join(os.path.dirname(__file__), "sample_data")
-    
-    if not os.path.exists(sample_folder):
-        print(f"   ❌ Sample data folder not found: {sample_folder}")
-        return
-    
+        lines.append(f"   ❌ Error getting status: {e}")
+    return lines
+
+
+async def step_scan(client, folder_request):
+    """Demo 3: Scan sample data folder; returns the lines to print"""
+    lines = ["3. Scanning sample data folder..."]
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{base_url}/api/v1/folder-monitoring/scan-folder",
-                json={"folder_path": sample_folder}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                files = result.get('scan_results', {}).get('files', [])
-                print(f"   ✅ Found {len(files)} files in sample data folder")
-                
-                # Show file details
-                for file in files:
-                    status_icon = "📄" if file['extension'] == '.pdf' else "📁"
-                    print(f"      {status_icon} {file['name']} ({file['extension']}) - {file['size']} bytes")
-            else:
-                print(f"   ❌ Folder scan failed: {response.status_code}")
-                print(f"      Error: {response.text}")
+        response = await client.post(
+            "/api/v1/folder-monitoring/scan-folder", json=folder_request
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            files = result.get('scan_results', {}).get('files', [])
+            lines.append(f"   ✅ Found {len(files)} files in sample data folder")
+
+            # Show file details
+            for file in files:
+                status_icon = "📄" if file['extension'] == '.pdf' else "📁"
+                lines.append(f"      {status_icon} {file['name']} ({file['extension']}) - {file['size']} bytes")
+        else:
+            lines.append(f"   ❌ Folder scan failed: {response.status_code}")
+            lines.append(f"      Error: {response.text}")
     except Exception as e:
-        print(f"   ❌ Error scanning folder: {e}")
-    
-    print()
-    
-    # Demo 4: Batch process sample data
+        lines.append(f"   ❌ Error scanning folder: {e}")
+    return lines
+
+
+async def step_batch_process(client, folder_request):
+    """Demo 4: Batch process sample data"""
     print("4. Batch processing sample data...")
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{base_url}/api/v1/folder-monitoring/batch-process",
-                json={"folder_path": sample_folder}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                summary = result.get('summary', {})
-                
-                print(f"   ✅ Batch processing completed!")
-                print(f"      📊 Summary: {summary.get('successful', 0)} successful, "
-                      f"{summary.get('failed', 0)} failed, {summary.get('skipped', 0)} skipped")
-                
-                # Show processing results
-                if result.get('processed_files'):
-                    print("      📋 Successfully processed:")
-                    for file in result['processed_files']:
-                        print(f"         ✅ {file['name']} - PO: {file.get('po_number', 'N/A')}")
-                
-                if result.get('errors'):
-                    print("      ⚠️  Errors/Skipped:")
-                    for file in result['errors']:
-                        icon = "⚠️" if file['status'] == 'skipped' else "❌"
-                        print(f"         {icon} {file['name']} - {file.get('error', 'No error details')}")
-            else:
-                print(f"   ❌ Batch processing failed: {response.status_code}")
-                print(f"      Error: {response.text}")
+        response = await client.post(
+            "/api/v1/folder-monitoring/batch-process", json=folder_request
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            summary = result.get('summary', {})
+
+            print(f"   ✅ Batch processing completed!")
+            print(f"      📊 Summary: {summary.get('successful', 0)} successful, "
+                  f"{summary.get('failed', 0)} failed, {summary.get('skipped', 0)} skipped")
+
+            # Show processing results
+            # Write each file list with a single call instead of one print per file
+            if result.get('processed_files'):
+                lines = ["      📋 Successfully processed:"]
+                lines += [
+                    f"         ✅ {file['name']} - PO: {file.get('po_number', 'N/A')}"
+                    for file in result['processed_files']
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
+
+            if result.get('errors'):
+                lines = ["      ⚠️  Errors/Skipped:"]
+                lines += [
+                    f"         {'⚠️' if file['status'] == 'skipped' else '❌'} "
+                    f"{file['name']} - {file.get('error', 'No error details')}"
+                    for file in result['errors']
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
+        else:
+            print(f"   ❌ Batch processing failed: {response.status_code}")
+            print(f"      Error: {response.text}")
     except Exception as e:
         print(f"   ❌ Error during batch processing: {e}")
+
+
+async def demo_batch_processing():
+    """Demonstrate the batch processing functionality"""
+    
+    base_url = "http://localhost:8000"
     
+    print("PRAT Batch Processing Demo")
+    print("=" * 50)
     print()
     
+    # One client (and connection pool) shared by every demo step
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        # Check if the application is running
+        try:
+            response = await client.get("/health")
+            if response.status_code != 200:
+                print("❌ Application is not responding properly")
+                return
+        except httpx.ConnectError:
+            print("❌ Cannot connect to PRAT application")
+            print("   Make sure the application is running on http://localhost:8000")
+            print("   Run: python start_app.py")
+            return
+
+        print("✅ Connected to PRAT application")
+        print()
+
+        sample_folder = os.path.join(os.path.dirname(__file__), "sample_data")
+        folder_request = {"folder_path": sample_folder}
+        sample_folder_exists = os.path.exists(sample_folder)
+
+        # Steps 1-3 are independent, so run them concurrently and print in order
+        steps = [step_create_folders(client), step_status(client)]
+        if sample_folder_exists:
+            steps.append(step_scan(client, folder_request))
+        for lines in await asyncio.gather(*steps):
+            print("\n".join(lines))
+            print()
+
+        if not sample_folder_exists:
+            print("3. Scanning sample data folder...")
+            print(f"   ❌ Sample data folder not found: {sample_folder}")
+            return
+
+        await step_batch_process(client, folder_request)
+        print()
+    
     # Demo 5: Show web interface info
     print("5. Web Interface Information")
     print("   🌐 Open your browser and navigate to: http://localhost:8000")
@@ -0,0 +1,8 @@
+-- Migration: 002_add_po_amount_date_indexes.sql
+-- Description: Index purchase order amount and date for range lookups
+-- Date: 2026-10-16
+
+-- Range filters (BETWEEN) on total_amount and po_date can use these btree
+-- indexes instead of scanning the whole purchase_orders table
+CREATE INDEX IF NOT EXISTS idx_po_total_amount ON purchase_orders(total_amount);
+CREATE INDEX IF NOT EXISTS idx_po_date ON purchase_orders(po_date);
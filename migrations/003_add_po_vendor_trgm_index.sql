@@ -0,0 +1,12 @@
+-- Migration: 003_add_po_vendor_trgm_index.sql
+-- Description: Trigram index on purchase order vendor names
+-- Date: 2026-10-16
+
+-- get_pos_by_vendor filters with vendor_name ILIKE '%...%'. A leading
+-- wildcard cannot use a btree index, but a pg_trgm GIN index can serve
+-- ILIKE substring matches directly, so the planner no longer falls back
+-- to a sequential scan of purchase_orders.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_po_vendor_trgm
+    ON purchase_orders USING gin (vendor_name gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- Migration: 004_add_po_status_index.sql
+-- Description: Index purchase order status for status lookups
+-- Date: 2026-10-16
+
+-- Composite index: serves status equality lookups on its own (leading
+-- column) as well as combined status + amount range filters such as the
+-- PO list endpoint. total_amount alone is covered by idx_po_total_amount.
+CREATE INDEX IF NOT EXISTS idx_po_status_amount ON purchase_orders(status, total_amount);
@@ -0,0 +1,86 @@
+-- Migration: 005_create_po_stats_cache.sql
+-- Description: Trigger-maintained purchase order statistics
+-- Date: 2026-10-16
+
+-- Summary tables read by POService.get_po_statistics. Triggers on
+-- purchase_orders keep them current, so reading statistics costs a few
+-- small lookups instead of aggregating the whole table. Overall totals are
+-- summed from the per-status rows rather than kept in a single row, which
+-- every PO write would otherwise have to lock. Safe to re-run.
+
+-- Drop the trigger first so the reseed below is not double counted
+DROP TRIGGER IF EXISTS maintain_po_stats ON purchase_orders;
+DROP TRIGGER IF EXISTS reset_po_stats ON purchase_orders;
+
+-- Superseded by the per-status totals
+DROP TABLE IF EXISTS po_stats_cache;
+
+CREATE TABLE IF NOT EXISTS po_status_counts (
+    status VARCHAR(50) PRIMARY KEY,
+    cnt INTEGER NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14,2) NOT NULL DEFAULT 0
+);
+ALTER TABLE po_status_counts
+    ADD COLUMN IF NOT EXISTS total_amount DECIMAL(14,2) NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS po_vendor_counts (
+    vendor VARCHAR(255) PRIMARY KEY,
+    cnt INTEGER NOT NULL DEFAULT 0
+);
+
+-- Seed from existing data, replacing whatever a previous run left behind
+DELETE FROM po_status_counts;
+INSERT INTO po_status_counts (status, cnt, total_amount)
+SELECT COALESCE(status, 'Unknown'), COUNT(*), COALESCE(SUM(total_amount), 0)
+FROM purchase_orders
+GROUP BY COALESCE(status, 'Unknown');
+
+DELETE FROM po_vendor_counts;
+INSERT INTO po_vendor_counts (vendor, cnt)
+SELECT COALESCE(vendor_name, 'Unknown'), COUNT(*) FROM purchase_orders
+GROUP BY COALESCE(vendor_name, 'Unknown');
+
+-- Apply the row delta of every insert/update/delete to the summary tables
+CREATE OR REPLACE FUNCTION tf_maintain_po_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE po_status_counts
+            SET cnt = cnt - 1,
+                total_amount = total_amount - COALESCE(OLD.total_amount, 0)
+            WHERE status = COALESCE(OLD.status, 'Unknown');
+        UPDATE po_vendor_counts SET cnt = cnt - 1
+            WHERE vendor = COALESCE(OLD.vendor_name, 'Unknown');
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO po_status_counts (status, cnt, total_amount)
+            VALUES (COALESCE(NEW.status, 'Unknown'), 1, COALESCE(NEW.total_amount, 0))
+            ON CONFLICT (status) DO UPDATE
+                SET cnt = po_status_counts.cnt + 1,
+                    total_amount = po_status_counts.total_amount + EXCLUDED.total_amount;
+        INSERT INTO po_vendor_counts (vendor, cnt) VALUES (COALESCE(NEW.vendor_name, 'Unknown'), 1)
+            ON CONFLICT (vendor) DO UPDATE SET cnt = po_vendor_counts.cnt + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER maintain_po_stats
+    AFTER INSERT OR DELETE OR UPDATE OF status, vendor_name, total_amount ON purchase_orders
+    FOR EACH ROW EXECUTE FUNCTION tf_maintain_po_stats();
+
+-- TRUNCATE skips row triggers, so empty the summary tables alongside it
+CREATE OR REPLACE FUNCTION tf_reset_po_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM po_status_counts;
+    DELETE FROM po_vendor_counts;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER reset_po_stats
+    AFTER TRUNCATE ON purchase_orders
+    FOR EACH STATEMENT EXECUTE FUNCTION tf_reset_po_stats();
@@ -0,0 +1,8 @@
+-- Migration: 006_add_po_number_upper_index.sql
+-- Description: Index upper(po_number) for case-insensitive PO number lookups
+-- Date: 2026-10-16
+
+-- POService matches PO numbers with upper(po_number) = upper(:po_number) so
+-- "po-001" finds "PO-001"; a plain btree on po_number cannot serve that
+-- predicate, this expression index can.
+CREATE INDEX IF NOT EXISTS idx_po_number_upper ON purchase_orders(upper(po_number));
@@ -0,0 +1,11 @@
+"""
+Make the project root importable for the scripts in this directory
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Guarded so repeated imports don't keep growing sys.path
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
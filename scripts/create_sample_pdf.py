@@ -7,7 +7,7 @@ import sys
 from pathlib import Path
 
 # Add the project root to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
@@ -16,6 +16,45 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
 
+# Styles are built once at import and reused for every generated invoice
+STYLES = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=STYLES['Heading1'],
+    fontSize=16,
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+HEADING2_STYLE = STYLES['Heading2']
+
+# Two-column label/value tables (header, vendor and payment sections)
+LABEL_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+LINE_ITEMS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey)
+])
+
+TOTALS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, -1), (1, -1), colors.lightgrey)
+])
+
 def create_sample_invoice():
     """Create a sample PDF invoice"""
     
@@ -27,23 +66,6 @@ def create_sample_invoice():
     pdf_path = sample_dir / "sample_invoice.pdf"
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
     
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    # Build the story (content)
-    story = []
-    
-    # Title
-    story.append(Paragraph("INVOICE", title_style))
-    story.append(Spacer(1, 20))
-    
     # Invoice header
     header_data = [
         ['Invoice Number:', 'INV-2024-001'],
@@ -53,15 +75,7 @@ def create_sample_invoice():
     ]
     
     header_table = Table(header_data, colWidths=[2*inch, 4*inch])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(header_table)
-    story.append(Spacer(1, 20))
+    header_table.setStyle(LABEL_TABLE_STYLE)
     
     # Vendor information
     vendor_data = [
@@ -73,15 +87,7 @@ def create_sample_invoice():
     ]
     
     vendor_table = Table(vendor_data, colWidths=[2*inch, 4*inch])
-    vendor_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(vendor_table)
-    story.append(Spacer(1, 20))
+    vendor_table.setStyle(LABEL_TABLE_STYLE)
     
     # Line items
     line_items_data = [
@@ -91,18 +97,7 @@ def create_sample_invoice():
     ]
     
     line_items_table = Table(line_items_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-    line_items_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey)
-    ]))
-    story.append(Paragraph("Line Items:", styles['Heading2']))
-    story.append(Spacer(1, 10))
-    story.append(line_items_table)
-    story.append(Spacer(1, 20))
+    line_items_table.setStyle(LINE_ITEMS_TABLE_STYLE)
     
     # Totals
     totals_data = [
@@ -112,17 +107,7 @@ def create_sample_invoice():
     ]
     
     totals_table = Table(totals_data, colWidths=[4*inch, 2*inch])
-    totals_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (1, -1), colors.lightgrey)
-    ]))
-    story.append(totals_table)
-    story.append(Spacer(1, 20))
+    totals_table.setStyle(TOTALS_TABLE_STYLE)
     
     # Payment terms
     payment_data = [
@@ -131,14 +116,24 @@ def create_sample_invoice():
     ]
     
     payment_table = Table(payment_data, colWidths=[2*inch, 4*inch])
-    payment_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(payment_table)
+    payment_table.setStyle(LABEL_TABLE_STYLE)
+    
+    # Build the story (content) in page order
+    story = [
+        Paragraph("INVOICE", TITLE_STYLE),
+        Spacer(1, 20),
+        header_table,
+        Spacer(1, 20),
+        vendor_table,
+        Spacer(1, 20),
+        Paragraph("Line Items:", HEADING2_STYLE),
+        Spacer(1, 10),
+        line_items_table,
+        Spacer(1, 20),
+        totals_table,
+        Spacer(1, 20),
+        payment_table,
+    ]
     
     # Build the PDF
     doc.build(story)
@@ -2,151 +2,213 @@
 """
 Create a sample Purchase Order PDF for testing PRAT
 """
+import io
 import os
 import sys
 from pathlib import Path
 
 # Add the project root to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
+from PyPDF2 import PdfReader, PdfWriter
 
-def create_sample_po():
+# Userspace buffer for the output PDF
+PDF_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# The sample PO is entirely static, so it is drawn straight onto a canvas at
+# precomputed positions instead of going through Platypus flowable layout
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = inch
+FRAME_WIDTH = PAGE_WIDTH - 2 * MARGIN
+CELL_PADDING = 6
+
+# Table styles: font size, cell alignment, bold cells and shaded row
+LABEL_TABLE_STYLE = {"font_size": 10, "align": "LEFT", "bold": "first_col", "shade": None}
+LINE_ITEMS_TABLE_STYLE = {"font_size": 9, "align": "CENTER", "bold": "first_row", "shade": (0, colors.grey)}
+TOTALS_TABLE_STYLE = {"font_size": 12, "align": "RIGHT", "bold": "all", "shade": (-1, colors.lightgrey)}
+
+# The template holds everything except the header values, which are overlaid per PO.
+# It lives in temp/, never in sample_data/, which is scanned and ingested as POs.
+TEMPLATE_PATH = Path("temp") / "_po_template.pdf"
+HEADER_LABELS = ('PO Number:', 'Date:', 'Vendor:', 'Vendor ID:')
+HEADER_TEMPLATE_DATA = tuple((label, '') for label in HEADER_LABELS)
+
+# Fixed table contents of the sample PO
+
+VENDOR_DATA = (
+    ('Company:', 'ABC Supplies Inc.'),
+    ('Address:', '123 Main St, Anytown, USA 12345'),
+    ('Phone:', '555-123-4567'),
+    ('Email:', 'orders@abcsupplies.com'),
+    ('Contact:', 'John Smith')
+)
+
+LINE_ITEMS_DATA = (
+    ('Description', 'Qty', 'Unit Price', 'Total', 'SKU', 'Part #'),
+    ('Office Chairs', '10', '$150.00', '$1,500.00', 'CHAIR-001', 'OC-100'),
+    ('Desk Lamps', '20', '$50.00', '$1,000.00', 'LAMP-001', 'DL-200')
+)
+
+TOTALS_DATA = (
+    ('Subtotal:', '$2,500.00'),
+    ('Tax (0%):', '$0.00'),
+    ('Total Authorized:', '$2,500.00')
+)
+
+TERMS_DATA = (
+    ('Payment Terms:', 'Net 30'),
+    ('Delivery Address:', '123 Business Ave, Corp City, USA 54321'),
+    ('Billing Address:', '123 Business Ave, Corp City, USA 54321'),
+    ('Contract Reference:', 'CONTRACT-2024-001'),
+    ('Status:', 'OPEN'),
+    ('Approved By:', 'John Smith'),
+    ('Approval Date:', '2024-01-16')
+)
+
+
+# (text, font size, gap after) for the title and the line-items heading
+TITLE = ("PURCHASE ORDER", 16, 50)
+LINE_ITEMS_HEADING = ("Line Items:", 14, 10)
+
+# (rows, column widths, style, gap after) in page order; the heading precedes line items
+TABLES = (
+    (HEADER_TEMPLATE_DATA, (2*inch, 4*inch), LABEL_TABLE_STYLE, 20),
+    (VENDOR_DATA, (2*inch, 4*inch), LABEL_TABLE_STYLE, 20),
+    (LINE_ITEMS_DATA, (2.5*inch, 0.8*inch, 1.2*inch, 1.2*inch, 1*inch, 1*inch), LINE_ITEMS_TABLE_STYLE, 20),
+    (TOTALS_DATA, (4*inch, 2*inch), TOTALS_TABLE_STYLE, 20),
+    (TERMS_DATA, (2*inch, 4*inch), LABEL_TABLE_STYLE, 0),
+)
+HEADER_INDEX = 0
+LINE_ITEMS_INDEX = 2
+
+def _compute_layout():
+    """Precompute the title/heading baselines and each table's top edge"""
+    y = PAGE_HEIGHT - MARGIN
+    title_y = y - TITLE[1]
+    y = title_y - TITLE[2]
+    heading_y = None
+    table_tops = []
+    for index, (rows, _, style, gap_after) in enumerate(TABLES):
+        if index == LINE_ITEMS_INDEX:
+            heading_y = y - LINE_ITEMS_HEADING[1]
+            y = heading_y - LINE_ITEMS_HEADING[2]
+        table_tops.append(y)
+        y -= len(rows) * (style["font_size"] + 2 * CELL_PADDING) + gap_after
+    return title_y, heading_y, tuple(table_tops)
+
+TITLE_Y, LINE_ITEMS_HEADING_Y, TABLE_TOPS = _compute_layout()
+
+def _draw_table(pdf, top, rows, col_widths, style):
+    """Draw a gridded table with its top edge at the given y, centred in the frame"""
+    font_size = style["font_size"]
+    row_height = font_size + 2 * CELL_PADDING
+    width = sum(col_widths)
+    left = MARGIN + (FRAME_WIDTH - width) / 2
+    bottom = top - len(rows) * row_height
+    
+    if style["shade"]:
+        shade_row, shade_color = style["shade"]
+        shade_row %= len(rows)
+        pdf.setFillColor(shade_color)
+        pdf.rect(left, top - (shade_row + 1) * row_height, width, row_height, stroke=0, fill=1)
+        pdf.setFillColor(colors.black)
+    
+    col_edges = [left]
+    for col_width in col_widths:
+        col_edges.append(col_edges[-1] + col_width)
+    row_edges = [top - i * row_height for i in range(len(rows) + 1)]
+    pdf.setStrokeColor(colors.black)
+    pdf.setLineWidth(1)
+    pdf.grid(col_edges, row_edges)
+    
+    bold = style["bold"]
+    align = style["align"]
+    for row_index, row in enumerate(rows):
+        baseline = top - (row_index + 1) * row_height + CELL_PADDING
+        for col_index, value in enumerate(row):
+            is_bold = (
+                bold == "all"
+                or (bold == "first_col" and col_index == 0)
+                or (bold == "first_row" and row_index == 0)
+            )
+            pdf.setFont("Helvetica-Bold" if is_bold else "Helvetica", font_size)
+            cell_left, cell_right = col_edges[col_index], col_edges[col_index + 1]
+            if align == "LEFT":
+                pdf.drawString(cell_left + CELL_PADDING, baseline, value)
+            elif align == "RIGHT":
+                pdf.drawRightString(cell_right - CELL_PADDING, baseline, value)
+            else:
+                pdf.drawCentredString((cell_left + cell_right) / 2, baseline, value)
+
+def _draw_header_values(pdf, values):
+    """Draw the per-PO header values into the template's blank header cells"""
+    _, col_widths, style, _ = TABLES[HEADER_INDEX]
+    top = TABLE_TOPS[HEADER_INDEX]
+    row_height = style["font_size"] + 2 * CELL_PADDING
+    value_left = MARGIN + (FRAME_WIDTH - sum(col_widths)) / 2 + col_widths[0] + CELL_PADDING
+    
+    pdf.setFont("Helvetica", style["font_size"])
+    for row_index, value in enumerate(values):
+        pdf.drawString(value_left, top - (row_index + 1) * row_height + CELL_PADDING, value)
+
+def _write_template(template_path):
+    """Draw the static PO skeleton (header values left blank) to the template file"""
+    with open(template_path, 'wb', buffering=PDF_WRITE_BUFFER_SIZE) as template_file:
+        pdf = canvas.Canvas(template_file, pagesize=letter)
+        
+        pdf.setFont("Helvetica-Bold", TITLE[1])
+        pdf.drawCentredString(PAGE_WIDTH / 2, TITLE_Y, TITLE[0])
+        pdf.setFont("Helvetica-Bold", LINE_ITEMS_HEADING[1])
+        pdf.drawString(MARGIN, LINE_ITEMS_HEADING_Y, LINE_ITEMS_HEADING[0])
+        
+        for top, (rows, col_widths, style, _) in zip(TABLE_TOPS, TABLES):
+            _draw_table(pdf, top, rows, col_widths, style)
+        
+        pdf.showPage()
+        pdf.save()
+
+def _template_is_current(template_path):
+    """True if the template exists and is newer than this script's layout"""
+    try:
+        return os.path.getmtime(template_path) >= os.path.getmtime(__file__)
+    except OSError:
+        return False
+
+def create_sample_po(po_number='PO-2024-001', po_date='2024-01-15',
+                     vendor_name='ABC Supplies Inc.', vendor_id='VEND-001'):
     """Create a sample PDF purchase order"""
     
     # Create the sample_data directory if it doesn't exist
     sample_dir = Path("sample_data")
     sample_dir.mkdir(exist_ok=True)
     
-    # Create the PDF file
     pdf_path = sample_dir / "sample_purchase_order.pdf"
-    doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    # Build the story (content)
-    story = []
-    
-    # Title
-    story.append(Paragraph("PURCHASE ORDER", title_style))
-    story.append(Spacer(1, 20))
-    
-    # PO header
-    header_data = [
-        ['PO Number:', 'PO-2024-001'],
-        ['Date:', '2024-01-15'],
-        ['Vendor:', 'ABC Supplies Inc.'],
-        ['Vendor ID:', 'VEND-001']
-    ]
-    
-    header_table = Table(header_data, colWidths=[2*inch, 4*inch])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(header_table)
-    story.append(Spacer(1, 20))
-    
-    # Vendor information
-    vendor_data = [
-        ['Company:', 'ABC Supplies Inc.'],
-        ['Address:', '123 Main St, Anytown, USA 12345'],
-        ['Phone:', '555-123-4567'],
-        ['Email:', 'orders@abcsupplies.com'],
-        ['Contact:', 'John Smith']
-    ]
-    
-    vendor_table = Table(vendor_data, colWidths=[2*inch, 4*inch])
-    vendor_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(vendor_table)
-    story.append(Spacer(1, 20))
-    
-    # Line items
-    line_items_data = [
-        ['Description', 'Qty', 'Unit Price', 'Total', 'SKU', 'Part #'],
-        ['Office Chairs', '10', '$150.00', '$1,500.00', 'CHAIR-001', 'OC-100'],
-        ['Desk Lamps', '20', '$50.00', '$1,000.00', 'LAMP-001', 'DL-200']
-    ]
-    
-    line_items_table = Table(line_items_data, colWidths=[2.5*inch, 0.8*inch, 1.2*inch, 1.2*inch, 1*inch, 1*inch])
-    line_items_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey)
-    ]))
-    story.append(Paragraph("Line Items:", styles['Heading2']))
-    story.append(Spacer(1, 10))
-    story.append(line_items_table)
-    story.append(Spacer(1, 20))
-    
-    # Totals
-    totals_data = [
-        ['Subtotal:', '$2,500.00'],
-        ['Tax (0%):', '$0.00'],
-        ['Total Authorized:', '$2,500.00']
-    ]
-    
-    totals_table = Table(totals_data, colWidths=[4*inch, 2*inch])
-    totals_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (1, -1), colors.lightgrey)
-    ]))
-    story.append(totals_table)
-    story.append(Spacer(1, 20))
-    
-    # Terms and conditions
-    terms_data = [
-        ['Payment Terms:', 'Net 30'],
-        ['Delivery Address:', '123 Business Ave, Corp City, USA 54321'],
-        ['Billing Address:', '123 Business Ave, Corp City, USA 54321'],
-        ['Contract Reference:', 'CONTRACT-2024-001'],
-        ['Status:', 'OPEN'],
-        ['Approved By:', 'John Smith'],
-        ['Approval Date:', '2024-01-16']
-    ]
-    
-    terms_table = Table(terms_data, colWidths=[2*inch, 4*inch])
-    terms_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(terms_table)
     
-    # Build the PDF
-    doc.build(story)
+    # Build the static skeleton once; later runs only draw the header values
+    template_path = TEMPLATE_PATH
+    if not _template_is_current(template_path):
+        template_path.parent.mkdir(exist_ok=True)
+        _write_template(template_path)
+    
+    overlay_buffer = io.BytesIO()
+    overlay = canvas.Canvas(overlay_buffer, pagesize=letter)
+    _draw_header_values(overlay, (po_number, po_date, vendor_name, vendor_id))
+    overlay.showPage()
+    overlay.save()
+    overlay_buffer.seek(0)
+    
+    page = PdfReader(str(template_path)).pages[0]
+    page.merge_page(PdfReader(overlay_buffer).pages[0])
+    writer = PdfWriter()
+    writer.add_page(page)
+    
+    # Write through a large buffer so serialization flushes in few syscalls
+    with open(pdf_path, 'wb', buffering=PDF_WRITE_BUFFER_SIZE) as pdf_file:
+        writer.write(pdf_file)
     
     print(f"✅ Sample PO PDF created: {pdf_path}")
     print(f"📄 File size: {pdf_path.stat().st_size / 1024:.1f} KB")
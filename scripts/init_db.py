@@ -7,8 +7,8 @@ import sys
 import logging
 from pathlib import Path
 
-# Add the app directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add the project root to the path
+import _bootstrap  # noqa: F401
 
 from app.config import settings
 from app.utils.logging import setup_logging
@@ -18,31 +18,73 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
+# Sample file contents, encoded once at import
+SAMPLE_INVOICE_BYTES = """
+INVOICE
+
+Invoice Number: INV-2024-001
+Date: 2024-01-15
+Due Date: 2024-02-15
+
+Vendor: ABC Supplies Inc.
+Vendor ID: VEND-001
+
+Line Items:
+1. Office Chairs - Qty: 10 - Unit Price: $150.00 - Total: $1,500.00
+2. Desk Lamps - Qty: 20 - Unit Price: $50.00 - Total: $1,000.00
+
+Subtotal: $2,500.00
+Tax: $250.00
+Total: $2,750.00
+
+Payment Terms: Net 30
+PO Reference: PO-2024-001
+        """.encode("utf-8")
+
+SAMPLE_README_BYTES = """
+# Sample Data
+
+This directory contains sample data for testing the PRAT application.
+
+## Files:
+- sample_invoice.txt: Sample invoice text for testing document processing
+
+## Usage:
+You can use these files to test the invoice processing functionality.
+        """.encode("utf-8")
+
+
+def write_bytes(path, payload):
+    """Write a complete payload with a single unbuffered binary write"""
+    with open(path, 'wb', buffering=0) as f:
+        f.write(payload)
+
+
 def create_directories():
     """Create necessary directories"""
     try:
-        # Create upload directory
-        os.makedirs(settings.upload_dir, exist_ok=True)
-        logger.info(f"Created upload directory: {settings.upload_dir}")
-        
-        # Create logs directory
-        log_dir = Path(settings.log_file).parent
-        os.makedirs(log_dir, exist_ok=True)
-        logger.info(f"Created logs directory: {log_dir}")
-        
-        # Create other necessary directories
-        directories = [
-            "sample_data",
-            "temp",
-            "exports"
-        ]
-        
-        for directory in directories:
+        # Upload, logs and the other working directories, resolved once
+        directories = {
+            os.path.normpath(path)
+            for path in (
+                settings.upload_dir,
+                str(Path(settings.log_file).parent),
+                "sample_data",
+                "temp",
+                "exports",
+            )
+        }
+        
+        # List the working directory once and only create what is missing
+        with os.scandir(".") as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+        
+        for directory in sorted(directories - existing):
             os.makedirs(directory, exist_ok=True)
-            logger.info(f"Created directory: {directory}")
+            logger.info("Created directory: %s", directory)
             
-    except Exception as e:
-        logger.error(f"Error creating directories: {e}")
+    except Exception:
+        logger.exception("Error creating directories")
         raise
 
 
@@ -60,23 +102,18 @@ def validate_configuration():
         
         for setting in required_settings:
             if not getattr(settings, setting, None):
-                logger.warning(f"Missing required setting: {setting}")
+                logger.warning("Missing required setting: %s", setting)
         
         # Check file permissions
-        test_file = os.path.join(settings.upload_dir, "test.txt")
-        try:
-            with open(test_file, 'w') as f:
-                f.write("test")
-            os.remove(test_file)
-            logger.info("File permissions test passed")
-        except Exception as e:
-            logger.error(f"File permissions test failed: {e}")
-            raise
+        if not os.access(settings.upload_dir, os.W_OK | os.X_OK):
+            logger.error("File permissions test failed: %s is not writable", settings.upload_dir)
+            raise PermissionError(f"Upload directory is not writable: {settings.upload_dir}")
+        logger.info("File permissions test passed")
         
         logger.info("Configuration validation completed")
         
-    except Exception as e:
-        logger.error(f"Configuration validation failed: {e}")
+    except Exception:
+        logger.exception("Configuration validation failed")
         raise
 
 
@@ -85,55 +122,18 @@ def create_sample_data():
     try:
         logger.info("Creating sample data...")
         
-        # Create sample invoice text
-        sample_invoice_text = """
-INVOICE
-
-Invoice Number: INV-2024-001
-Date: 2024-01-15
-Due Date: 2024-02-15
-
-Vendor: ABC Supplies Inc.
-Vendor ID: VEND-001
-
-Line Items:
-1. Office Chairs - Qty: 10 - Unit Price: $150.00 - Total: $1,500.00
-2. Desk Lamps - Qty: 20 - Unit Price: $50.00 - Total: $1,000.00
-
-Subtotal: $2,500.00
-Tax: $250.00
-Total: $2,750.00
-
-Payment Terms: Net 30
-PO Reference: PO-2024-001
-        """
-        
         sample_file = "sample_data/sample_invoice.txt"
-        with open(sample_file, 'w') as f:
-            f.write(sample_invoice_text)
+        write_bytes(sample_file, SAMPLE_INVOICE_BYTES)
         
-        logger.info(f"Created sample invoice: {sample_file}")
+        logger.info("Created sample invoice: %s", sample_file)
         
         # Create README for sample data
-        readme_content = """
-# Sample Data
-
-This directory contains sample data for testing the PRAT application.
-
-## Files:
-- sample_invoice.txt: Sample invoice text for testing document processing
-
-## Usage:
-You can use these files to test the invoice processing functionality.
-        """
-        
-        with open("sample_data/README.md", 'w') as f:
-            f.write(readme_content)
+        write_bytes("sample_data/README.md", SAMPLE_README_BYTES)
         
         logger.info("Created sample data README")
         
-    except Exception as e:
-        logger.error(f"Error creating sample data: {e}")
+    except Exception:
+        logger.exception("Error creating sample data")
         raise
 
 
@@ -154,8 +154,8 @@ def main():
         logger.info("PRAT initialization completed successfully!")
         logger.info("You can now start the application with: uvicorn app.main:app --reload")
         
-    except Exception as e:
-        logger.error(f"Initialization failed: {e}")
+    except Exception:
+        logger.exception("Initialization failed")
         sys.exit(1)
 
 
@@ -5,7 +5,6 @@ Startup script for PRAT application
 
 import os
 import sys
-import uvicorn
 from pathlib import Path
 
 def main():
@@ -13,20 +12,28 @@ def main():
     print("PRAT - Pay Request Approval Tool")
     print("=" * 40)
     
+    # List the project root (and app/) once; every check below is a set lookup
+    with os.scandir(".") as entries:
+        root_entries = {entry.name: entry.is_dir() for entry in entries}
+    app_entries = set()
+    if root_entries.get("app"):
+        with os.scandir("app") as entries:
+            app_entries = {entry.name for entry in entries}
+    
     # Check if we're in the right directory
-    if not os.path.exists("app/main.py"):
+    if "main.py" not in app_entries:
         print("Error: Please run this script from the PRAT- directory")
         print("Current directory:", os.getcwd())
         sys.exit(1)
     
     # Check for required files
     required_files = [
-        "app/main.py",
-        "app/config.py",
-        "requirements.txt"
+        ("app/main.py", "main.py" in app_entries),
+        ("app/config.py", "config.py" in app_entries),
+        ("requirements.txt", "requirements.txt" in root_entries)
     ]
     
-    missing_files = [f for f in required_files if not os.path.exists(f)]
+    missing_files = [f for f, present in required_files if not present]
     if missing_files:
         print("Error: Missing required files:")
         for f in missing_files:
@@ -34,15 +41,16 @@ def main():
         sys.exit(1)
     
     # Check for .env file
-    if not os.path.exists(".env"):
+    if ".env" not in root_entries:
         print("Warning: .env file not found. Using default configuration.")
         print("Consider copying .env.example to .env and configuring your settings.")
         print()
     
-    # Create required directories
-    directories = ["logs", "uploads", "purchase_orders", "invoices", "processed"]
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+    # Create the required directories that are missing from the root listing
+    directories = {"logs", "uploads", "purchase_orders", "invoices", "processed"}
+    existing = {name for name, is_dir in root_entries.items() if is_dir}
+    for directory in directories - existing:
+        os.mkdir(directory)
     
     print("Starting PRAT application...")
     print("Web interface will be available at: http://localhost:8000")
@@ -52,6 +60,9 @@ def main():
     print("=" * 40)
     
     try:
+        # Imported only once the pre-flight checks pass; uvicorn pulls in the whole server stack
+        import uvicorn
+        
         # Start the application
         uvicorn.run(
             "app.main:app",
@@ -4,13 +4,9 @@ Test script for the new batch processing functionality
 """
 
 import os
-import sys
+import json
 import asyncio
 import httpx
-from pathlib import Path
-
-# Add the app directory to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 async def test_batch_processing():
     """Test the batch processing functionality"""
@@ -24,15 +20,36 @@ async def test_batch_processing():
     print(f"Testing batch processing with folder: {test_folder}")
     print("=" * 60)
     
-    async with httpx.AsyncClient() as client:
+    # One pooled client for all requests, with room for the concurrent probes
+    limits = httpx.Limits(max_connections=8, max_keepalive_connections=8)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
         try:
-            # Test 1: Scan folder
-            print("1. Testing folder scan...")
-            scan_response = await client.post(
-                f"{base_url}/api/v1/folder-monitoring/scan-folder",
-                json={"folder_path": test_folder}
+            # Encode the shared request body once and send the bytes with each POST
+            folder_payload = json.dumps({"folder_path": test_folder}, separators=(",", ":")).encode()
+            json_headers = {"content-type": "application/json"}
+            
+            # The three probes are independent: fire them together and report in order
+            responses = await asyncio.gather(
+                client.post(
+                    "/api/v1/folder-monitoring/scan-folder",
+                    content=folder_payload,
+                    headers=json_headers,
+                ),
+                client.post(
+                    "/api/v1/folder-monitoring/batch-process",
+                    content=folder_payload,
+                    headers=json_headers,
+                ),
+                client.get("/api/v1/folder-monitoring/status"),
+                return_exceptions=True,
             )
+            for response in responses:
+                if isinstance(response, BaseException):
+                    raise response
+            scan_response, batch_response, status_response = responses
             
+            # Test 1: Scan folder
+            print("1. Testing folder scan...")
             if scan_response.status_code == 200:
                 scan_result = scan_response.json()
                 print(f"   ✓ Folder scan successful")
@@ -51,11 +68,6 @@ async def test_batch_processing():
             
             # Test 2: Batch process folder
             print("2. Testing batch processing...")
-            batch_response = await client.post(
-                f"{base_url}/api/v1/folder-monitoring/batch-process",
-                json={"folder_path": test_folder}
-            )
-            
             if batch_response.status_code == 200:
                 batch_result = batch_response.json()
                 print(f"   ✓ Batch processing successful")
@@ -82,8 +94,6 @@ async def test_batch_processing():
             print("3. Testing system status...")
             
             # Test 3: Get system status
-            status_response = await client.get(f"{base_url}/api/v1/folder-monitoring/status")
-            
             if status_response.status_code == 200:
                 status_result = status_response.json()
                 print(f"   ✓ System status retrieved")
@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the PRAT test suite
+
+The app.core and app.services modules pull in langchain, pdfplumber and the
+database layer, so they are imported inside the fixtures rather than at
+collection time.
+"""
+
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture(scope="module")
+def _mock_llms():
+    """Patch both ChatOpenAI clients once for the requesting module"""
+    with patch("app.core.document_processor.ChatOpenAI") as doc_llm, patch(
+        "app.core.recommendation_engine.ChatOpenAI"
+    ) as rec_llm:
+        yield doc_llm, rec_llm
+
+
+@pytest.fixture(scope="module")
+def doc_processor(_mock_llms):
+    """Create one document processor per module with the LLM client mocked"""
+    from app.core.document_processor import DocumentProcessor
+
+    return DocumentProcessor()
+
+
+@pytest.fixture(scope="module")
+def recommendation_engine(_mock_llms):
+    """Create one recommendation engine per module with the LLM client mocked"""
+    from app.core.recommendation_engine import RecommendationEngine
+
+    return RecommendationEngine()
+
+
+@pytest.fixture(scope="module")
+def business_rules_engine():
+    """Create one business rules engine per module"""
+    from app.core.business_rules import BusinessRulesEngine
+
+    return BusinessRulesEngine()
+
+
+@pytest.fixture(scope="module")
+def po_service():
+    """Create a PO service shared by the matcher tests"""
+    from app.services.po_service import POService
+
+    return POService()
+
+
+@pytest.fixture(scope="module")
+def matcher(po_service):
+    """Create a PO matcher backed by the shared PO service"""
+    from app.core.po_matcher import POMatcher
+
+    return POMatcher(po_service)
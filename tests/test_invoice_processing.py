@@ -3,10 +3,9 @@ Tests for invoice processing functionality
 """
 
 import pytest
-import tempfile
-import os
 from decimal import Decimal
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 from app.models.invoice import Invoice, InvoiceLineItem
@@ -15,139 +14,209 @@ from app.models.recommendation import (
     ProcessingRecommendation,
     ValidationResult,
     ActionType,
+    BusinessRuleViolation,
+    ViolationType,
 )
-from app.core.document_processor import DocumentProcessor
-from app.core.po_matcher import POMatcher
-from app.core.business_rules import BusinessRulesEngine
-from app.core.recommendation_engine import RecommendationEngine
-from app.services.po_service import POService
+
+# Keep the ChatOpenAI clients patched for every test in this module
+pytestmark = pytest.mark.usefixtures("_mock_llms")
+
+# Shared constants, parsed once at import instead of in every test
+D10 = Decimal("10.00")
+D50 = Decimal("50.00")
+D60 = Decimal("60.00")
+D100 = Decimal("100.00")
+D110 = Decimal("110.00")
+D120 = Decimal("120.00")
+D150 = Decimal("150.00")
+D250 = Decimal("250.00")
+D1000 = Decimal("1000.00")
+D1500 = Decimal("1500.00")
+D2500 = Decimal("2500.00")
+D2750 = Decimal("2750.00")
+_NOW = datetime(2024, 1, 1)
+_INV_DATE = datetime(2024, 1, 15)
+_DUE_DATE = datetime(2024, 2, 15)
+_PO_DATE = datetime(2024, 1, 10)
+
+
+def _document_kwargs(cls, total):
+    """Build constructor kwargs for a one-line Invoice or PurchaseOrder"""
+    if cls is Invoice:
+        return dict(
+            invoice_number="INV-001",
+            vendor_name="Test Vendor",
+            invoice_date=_NOW,
+            due_date=_NOW,
+            total_amount=total,
+            tax_amount=D10,
+            subtotal_amount=D100,
+            line_items=[
+                InvoiceLineItem(
+                    description="Item 1",
+                    quantity=1,
+                    unit_price=D100,
+                    total_price=D100,
+                )
+            ],
+        )
+    return dict(
+        po_number="PO-001",
+        vendor_name="Test Vendor",
+        po_date=_NOW,
+        total_authorized=total,
+        line_items=[
+            POLineItem(
+                description="Item 1",
+                quantity=1,
+                unit_price=D100,
+                total_price=D100,
+            )
+        ],
+    )
 
 
 class TestInvoiceProcessing:
     """Test invoice processing functionality"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_invoice(self):
-        """Create a sample invoice for testing"""
+        """Create a sample invoice for testing (shared, read-only)"""
         return Invoice(
             invoice_number="INV-2024-001",
             vendor_name="ABC Supplies Inc.",
             vendor_id="VEND-001",
-            invoice_date=datetime(2024, 1, 15),
-            due_date=datetime(2024, 2, 15),
-            total_amount=Decimal("2750.00"),
-            tax_amount=Decimal("250.00"),
-            subtotal_amount=Decimal("2500.00"),
+            invoice_date=_INV_DATE,
+            due_date=_DUE_DATE,
+            total_amount=D2750,
+            tax_amount=D250,
+            subtotal_amount=D2500,
             currency="USD",
             line_items=[
                 InvoiceLineItem(
                     description="Office Chairs",
                     quantity=10,
-                    unit_price=Decimal("150.00"),
-                    total_price=Decimal("1500.00"),
+                    unit_price=D150,
+                    total_price=D1500,
                     sku="CHAIR-001",
                 ),
                 InvoiceLineItem(
                     description="Desk Lamps",
                     quantity=20,
-                    unit_price=Decimal("50.00"),
-                    total_price=Decimal("1000.00"),
+                    unit_price=D50,
+                    total_price=D1000,
                     sku="LAMP-001",
                 ),
             ],
             po_reference="PO-2024-001",
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_po(self):
-        """Create a sample purchase order for testing"""
+        """Create a sample purchase order for testing (shared, read-only)"""
         return PurchaseOrder(
             po_number="PO-2024-001",
             vendor_name="ABC Supplies Inc.",
             vendor_id="VEND-001",
-            po_date=datetime(2024, 1, 10),
-            total_authorized=Decimal("2500.00"),
+            po_date=_PO_DATE,
+            total_authorized=D2500,
             currency="USD",
             line_items=[
                 POLineItem(
                     description="Office Chairs",
                     quantity=10,
-                    unit_price=Decimal("150.00"),
-                    total_price=Decimal("1500.00"),
+                    unit_price=D150,
+                    total_price=D1500,
                     sku="CHAIR-001",
                 ),
                 POLineItem(
                     description="Desk Lamps",
                     quantity=20,
-                    unit_price=Decimal("50.00"),
-                    total_price=Decimal("1000.00"),
+                    unit_price=D50,
+                    total_price=D1000,
                     sku="LAMP-001",
                 ),
             ],
         )
 
+    @pytest.fixture(scope="module")
+    def mock_validation_result(self):
+        """Create a failed PO validation result for recommendation tests"""
+        return ValidationResult(
+            is_valid=False,
+            confidence_score=0.8,
+            po_found=True,
+            po_number="PO-2024-001",
+            total_line_items=2,
+            matched_line_items=2,
+        )
+
+    @pytest.fixture(scope="module")
+    def amount_violations(self):
+        """Create a single amount-threshold business rule violation"""
+        return [
+            BusinessRuleViolation(
+                violation_type=ViolationType.AMOUNT_EXCEEDS_THRESHOLD,
+                severity="MEDIUM",
+                description="Amount exceeds threshold",
+            )
+        ]
+
     def test_invoice_creation(self, sample_invoice):
         """Test invoice creation and validation"""
         assert sample_invoice.invoice_number == "INV-2024-001"
         assert sample_invoice.vendor_name == "ABC Supplies Inc."
-        assert sample_invoice.total_amount == Decimal("2750.00")
+        assert sample_invoice.total_amount == D2750
         assert len(sample_invoice.line_items) == 2
 
         # Test line item validation
-        for item in sample_invoice.line_items:
-            assert item.total_price == item.quantity * item.unit_price
+        assert all(
+            item.total_price == item.quantity * item.unit_price
+            for item in sample_invoice.line_items
+        )
 
     def test_po_creation(self, sample_po):
         """Test purchase order creation and validation"""
         assert sample_po.po_number == "PO-2024-001"
         assert sample_po.vendor_name == "ABC Supplies Inc."
-        assert sample_po.total_authorized == Decimal("2500.00")
+        assert sample_po.total_authorized == D2500
         assert len(sample_po.line_items) == 2
 
         # Test line item validation
-        for item in sample_po.line_items:
-            assert item.total_price == item.quantity * item.unit_price
+        assert all(
+            item.total_price == item.quantity * item.unit_price
+            for item in sample_po.line_items
+        )
 
-    @patch("app.core.document_processor.ChatOpenAI")
-    def test_document_processor_initialization(self, mock_llm):
+    def test_document_processor_initialization(self, doc_processor):
         """Test document processor initialization"""
-        processor = DocumentProcessor()
-        assert processor.llm is not None
+        assert doc_processor.llm is not None
 
-    def test_po_matcher_initialization(self):
+    def test_po_matcher_initialization(self, matcher):
         """Test PO matcher initialization"""
-        po_service = POService()
-        matcher = POMatcher(po_service)
         assert matcher.po_service is not None
 
-    def test_business_rules_engine_initialization(self):
+    def test_business_rules_engine_initialization(self, business_rules_engine):
         """Test business rules engine initialization"""
-        engine = BusinessRulesEngine()
-        assert engine.auto_approve_threshold > 0
-        assert engine.require_manual_review_threshold > 0
+        assert business_rules_engine.auto_approve_threshold > 0
+        assert business_rules_engine.require_manual_review_threshold > 0
 
-    @patch("app.core.recommendation_engine.ChatOpenAI")
-    def test_recommendation_engine_initialization(self, mock_llm):
+    def test_recommendation_engine_initialization(self, recommendation_engine):
         """Test recommendation engine initialization"""
-        engine = RecommendationEngine()
-        assert engine.llm is not None
+        assert recommendation_engine.llm is not None
 
-    def test_po_matching_by_reference(self, sample_invoice, sample_po):
+    def test_po_matching_by_reference(
+        self, po_service, matcher, sample_invoice, sample_po
+    ):
         """Test PO matching by direct reference"""
-        po_service = POService()
-        matcher = POMatcher(po_service)
-
         # Mock the PO service to return our sample PO
         with patch.object(po_service, "get_po_by_number", return_value=sample_po):
             matching_po = matcher.find_matching_po(sample_invoice)
             assert matching_po is not None
             assert matching_po.po_number == "PO-2024-001"
 
-    def test_po_validation(self, sample_invoice, sample_po):
+    def test_po_validation(self, matcher, sample_invoice, sample_po):
         """Test PO validation against invoice"""
-        po_service = POService()
-        matcher = POMatcher(po_service)
-
         validation_result = matcher.validate_invoice_against_po(
             sample_invoice, sample_po
         )
@@ -160,54 +229,38 @@ class TestInvoiceProcessing:
         # Should have violations due to amount overage
         assert len(validation_result.violations) > 0
 
-    def test_business_rules_check(self, sample_invoice):
+    def test_business_rules_check(self, business_rules_engine, sample_invoice):
         """Test business rules validation"""
-        engine = BusinessRulesEngine()
-        violations = engine.check_business_rules(sample_invoice)
+        violations = business_rules_engine.check_business_rules(sample_invoice)
 
         # Should have violations due to amount exceeding threshold
         assert len(violations) > 0
 
         # Check for specific violation types
-        violation_types = [str(v.violation_type) for v in violations]
-        assert "AMOUNT_EXCEEDS_THRESHOLD" in violation_types
+        assert any(
+            v.violation_type == ViolationType.AMOUNT_EXCEEDS_THRESHOLD
+            for v in violations
+        )
 
-    @patch("app.core.recommendation_engine.ChatOpenAI")
-    def test_recommendation_generation(self, mock_llm, sample_invoice):
+    def test_recommendation_generation(
+        self,
+        recommendation_engine,
+        sample_invoice,
+        mock_validation_result,
+        amount_violations,
+    ):
         """Test recommendation generation"""
         # Mock LLM response
-        mock_response = Mock()
-        mock_response.content = (
-            '{"action": "MANUAL_REVIEW", "reasoning": "Test reasoning"}'
+        mock_response = SimpleNamespace(
+            content='{"action": "MANUAL_REVIEW", "reasoning": "Test reasoning"}'
         )
-        mock_llm.return_value.invoke.return_value = mock_response
-
-        engine = RecommendationEngine()
-
-        # Create mock validation result
-        validation_result = ValidationResult(
-            is_valid=False,
-            confidence_score=0.8,
-            po_found=True,
-            po_number="PO-2024-001",
-            total_line_items=2,
-            matched_line_items=2,
-        )
-
-        # Create mock business rule violations
-        from app.models.recommendation import BusinessRuleViolation, ViolationType
+        engine = recommendation_engine
 
-        violations = [
-            BusinessRuleViolation(
-                violation_type=ViolationType.AMOUNT_EXCEEDS_THRESHOLD,
-                severity="MEDIUM",
-                description="Amount exceeds threshold",
+        # Patch locally; the engine fixture is shared across the module
+        with patch.object(engine.llm, "invoke", return_value=mock_response):
+            recommendation = engine.generate_recommendation(
+                sample_invoice, mock_validation_result, amount_violations
             )
-        ]
-
-        recommendation = engine.generate_recommendation(
-            sample_invoice, validation_result, violations
-        )
 
         assert recommendation is not None
         assert recommendation.action in [
@@ -219,175 +272,83 @@ class TestInvoiceProcessing:
         assert recommendation.confidence_score >= 0.0
         assert recommendation.confidence_score <= 1.0
 
-    def test_invoice_line_item_validation(self):
-        """Test invoice line item validation"""
+    @pytest.mark.parametrize("cls", [InvoiceLineItem, POLineItem])
+    def test_line_item_validation(self, cls):
+        """Test invoice and PO line item validation"""
         # Valid line item
-        valid_item = InvoiceLineItem(
+        valid_item = cls(
             description="Test Item",
             quantity=5,
-            unit_price=Decimal("10.00"),
-            total_price=Decimal("50.00"),
+            unit_price=D10,
+            total_price=D50,
         )
-        assert valid_item.total_price == Decimal("50.00")
+        assert valid_item.total_price == D50
 
         # Invalid line item (should raise validation error)
-        with pytest.raises(ValueError):
-            InvoiceLineItem(
+        with pytest.raises(ValueError, match="Total price"):
+            cls(
                 description="Test Item",
                 quantity=5,
-                unit_price=Decimal("10.00"),
-                total_price=Decimal("60.00"),  # Incorrect total
+                unit_price=D10,
+                total_price=D60,  # Incorrect total
             )
 
-    def test_po_line_item_validation(self):
-        """Test PO line item validation"""
-        # Valid line item
-        valid_item = POLineItem(
-            description="Test Item",
-            quantity=5,
-            unit_price=Decimal("10.00"),
-            total_price=Decimal("50.00"),
-        )
-        assert valid_item.total_price == Decimal("50.00")
+    @pytest.mark.parametrize(
+        "cls, total_field, valid_total, error",
+        [
+            (Invoice, "total_amount", D110, "Total amount"),
+            (PurchaseOrder, "total_authorized", D100, "Total authorized"),
+        ],
+    )
+    def test_total_validation(self, cls, total_field, valid_total, error):
+        """Test invoice and PO total validation"""
+        # Valid document
+        valid_doc = cls(**_document_kwargs(cls, valid_total))
+        assert getattr(valid_doc, total_field) == valid_total
 
-        # Invalid line item (should raise validation error)
-        with pytest.raises(ValueError):
-            POLineItem(
-                description="Test Item",
-                quantity=5,
-                unit_price=Decimal("10.00"),
-                total_price=Decimal("60.00"),  # Incorrect total
-            )
-
-    def test_invoice_total_validation(self):
-        """Test invoice total validation"""
-        # Valid invoice
-        valid_invoice = Invoice(
-            invoice_number="INV-001",
-            vendor_name="Test Vendor",
-            invoice_date=datetime.now(),
-            due_date=datetime.now(),
-            total_amount=Decimal("110.00"),
-            tax_amount=Decimal("10.00"),
-            subtotal_amount=Decimal("100.00"),
-            line_items=[
-                InvoiceLineItem(
-                    description="Item 1",
-                    quantity=1,
-                    unit_price=Decimal("100.00"),
-                    total_price=Decimal("100.00"),
-                )
-            ],
-        )
-        assert valid_invoice.total_amount == Decimal("110.00")
-
-        # Invalid invoice (should raise validation error)
-        with pytest.raises(ValueError):
-            Invoice(
-                invoice_number="INV-001",
-                vendor_name="Test Vendor",
-                invoice_date=datetime.now(),
-                due_date=datetime.now(),
-                total_amount=Decimal("120.00"),  # Incorrect total
-                tax_amount=Decimal("10.00"),
-                subtotal_amount=Decimal("100.00"),
-                line_items=[
-                    InvoiceLineItem(
-                        description="Item 1",
-                        quantity=1,
-                        unit_price=Decimal("100.00"),
-                        total_price=Decimal("100.00"),
-                    )
-                ],
-            )
-
-    def test_po_total_validation(self):
-        """Test PO total validation"""
-        # Valid PO
-        valid_po = PurchaseOrder(
-            po_number="PO-001",
-            vendor_name="Test Vendor",
-            po_date=datetime.now(),
-            total_authorized=Decimal("100.00"),
-            line_items=[
-                POLineItem(
-                    description="Item 1",
-                    quantity=1,
-                    unit_price=Decimal("100.00"),
-                    total_price=Decimal("100.00"),
-                )
-            ],
-        )
-        assert valid_po.total_authorized == Decimal("100.00")
-
-        # Invalid PO (should raise validation error)
-        with pytest.raises(ValueError):
-            PurchaseOrder(
-                po_number="PO-001",
-                vendor_name="Test Vendor",
-                po_date=datetime.now(),
-                total_authorized=Decimal("120.00"),  # Incorrect total
-                line_items=[
-                    POLineItem(
-                        description="Item 1",
-                        quantity=1,
-                        unit_price=Decimal("100.00"),
-                        total_price=Decimal("100.00"),
-                    )
-                ],
-            )
+        # Invalid document (should raise validation error)
+        with pytest.raises(ValueError, match=error):
+            cls(**_document_kwargs(cls, D120))  # Incorrect total
 
 
 class TestDocumentProcessing:
     """Test document processing functionality"""
 
-    def test_text_extraction_from_pdf(self):
+    def test_text_extraction_from_pdf(self, doc_processor):
         """Test PDF text extraction (mock)"""
-        processor = DocumentProcessor()
-
-        # Create a temporary PDF file for testing
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"%PDF-1.4\nTest PDF content\n%%EOF")
-            temp_file_path = temp_file.name
-
-        try:
-            # Test text extraction (this will fail without proper PDF content, but tests the method)
-            with patch("pdfplumber.open") as mock_pdfplumber:
-                mock_page = Mock()
-                mock_page.extract_text.return_value = "Test invoice content"
-                mock_pdfplumber.return_value.__enter__.return_value.pages = [mock_page]
-
-                text = processor.extract_text_from_pdf(temp_file_path)
-                assert "Test invoice content" in text
-        finally:
-            os.unlink(temp_file_path)
-
-    def test_ocr_processing(self):
-        """Test OCR processing (mock)"""
-        processor = DocumentProcessor()
+        processor = doc_processor
+
+        # pdfplumber is mocked, so the path is never opened
+        with patch("pdfplumber.open") as mock_pdfplumber:
+            mock_page = Mock()
+            mock_page.extract_text.return_value = "Test invoice content"
+            mock_pdfplumber.return_value.__enter__.return_value.pages = [mock_page]
 
-        # Create a temporary image file for testing
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-            temp_file.write(b"PNG\nTest image content")
-            temp_file_path = temp_file.name
+            text = processor.extract_text_from_pdf("/fake.pdf")
+            assert "Test invoice content" in text
+
+    def test_ocr_processing(self, doc_processor):
+        """Test OCR processing (mock)"""
+        processor = doc_processor
 
-        try:
-            # Test OCR (this will fail without proper image content, but tests the method)
-            with patch("pytesseract.image_to_string") as mock_ocr:
-                mock_ocr.return_value = "Test OCR content"
+        # Image loading and tesseract are both mocked, so the path is never opened
+        with patch("app.core.document_processor.Image.open"), patch(
+            "pytesseract.image_to_string"
+        ) as mock_ocr:
+            mock_ocr.return_value = "Test OCR content"
 
-                text = processor.perform_ocr(temp_file_path)
-                assert "Test OCR content" in text
-        finally:
-            os.unlink(temp_file_path)
+            text = processor.perform_ocr("/fake.png")
+            assert "Test OCR content" in text
 
-    def test_file_type_detection(self):
+    def test_file_type_detection(self, doc_processor):
         """Test file type detection"""
-        processor = DocumentProcessor()
+        processor = doc_processor
 
         # Test PDF detection
-        text, file_type = processor.extract_text_from_file("test.pdf")
-        assert file_type == "pdf"
+        with patch.object(processor, "extract_text_from_pdf") as mock_pdf:
+            mock_pdf.return_value = "Test content"
+            text, file_type = processor.extract_text_from_file("test.pdf")
+            assert file_type == "pdf"
 
         # Test image detection
         with patch.object(processor, "perform_ocr") as mock_ocr:
@@ -396,7 +357,7 @@ class TestDocumentProcessing:
             assert file_type == "image"
 
         # Test unsupported file type
-        with pytest.raises(ValueError):
+        with pytest.raises(ValueError, match="Unsupported file type"):
             processor.extract_text_from_file("test.txt")
 
 
@@ -0,0 +1,320 @@
+"""
+Tests for the purchase order service
+"""
+
+import pytest
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+# app.core must load first: its package init imports po_matcher, which imports po_service
+import app.core  # noqa: F401
+from app.models.database_models import PurchaseOrderDB, POLineItemDB
+from app.services import po_service as po_service_module
+from app.services.po_service import POService, invalidate_cached_pos
+
+_PO_DATE = datetime(2024, 1, 10)
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_for_sqlite(type_, compiler, **kw):
+    """Render the PostgreSQL UUID columns as CHAR(32) so the tables build on SQLite"""
+    return "CHAR(32)"
+
+
+def _po_data(po_number="PO-2024-001", total="1500.00"):
+    """Build a one-line PO payload in the shape create_po accepts"""
+    return {
+        "po_number": po_number,
+        "vendor_name": "ABC Supplies Inc.",
+        "vendor_id": "VEND-001",
+        "po_date": _PO_DATE,
+        "total_authorized": Decimal(total),
+        "line_items": [
+            {
+                "description": "Office Chairs",
+                "quantity": 10,
+                "unit_price": Decimal(total) / 10,
+                "total_price": Decimal(total),
+                "sku": "CHAIR-001",
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """SQLite database holding the PO tables, one connection per session"""
+    # A file database, so a caller's open transaction stays invisible to other sessions
+    engine = create_engine(f"sqlite:///{tmp_path / 'po.db'}")
+    PurchaseOrderDB.metadata.create_all(
+        engine, tables=[PurchaseOrderDB.__table__, POLineItemDB.__table__]
+    )
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def db_context(session_factory):
+    """Point the service's own sessions at the test database"""
+
+    @contextmanager
+    def get_db_context():
+        db = session_factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    with patch.object(po_service_module, "get_db_context", get_db_context):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def empty_po_cache():
+    """Start and finish every test with an empty shared PO cache"""
+    po_service_module._po_cache.clear()
+    yield
+    po_service_module._po_cache.clear()
+
+
+@pytest.fixture
+def service():
+    """Create a PO service with one stored PO"""
+    svc = POService()
+    assert svc.create_po(_po_data()) is not None
+    return svc
+
+
+def _delete_behind_service(session_factory, po_number):
+    """Delete a PO without going through POService, so no invalidation happens"""
+    with session_factory() as db:
+        db.query(PurchaseOrderDB).filter_by(po_number=po_number).delete()
+        db.commit()
+
+
+class TestPOCache:
+    """Test the shared get_po_by_number cache"""
+
+    def test_miss_is_not_cached(self, service):
+        """Test that unknown PO numbers return None and leave the cache empty"""
+        assert service.get_po_by_number("PO-UNKNOWN") is None
+        assert len(po_service_module._po_cache) == 0
+
+    def test_hit_skips_database(self, service, session_factory):
+        """Test that a cached PO is served without querying the database"""
+        assert service.get_po_by_number("po-2024-001") is not None
+
+        _delete_behind_service(session_factory, "PO-2024-001")
+
+        cached = service.get_po_by_number("PO-2024-001")
+        assert cached is not None
+        assert cached.po_number == "PO-2024-001"
+
+    def test_cache_is_shared_between_instances(self, service, session_factory):
+        """Test that every POService reads the same cache"""
+        service.get_po_by_number("PO-2024-001")
+        _delete_behind_service(session_factory, "PO-2024-001")
+
+        assert POService().get_po_by_number("PO-2024-001") is not None
+
+    def test_hits_return_copies(self, service):
+        """Test that mutating a returned PO does not change the cached one"""
+        first = service.get_po_by_number("PO-2024-001")
+        first.status = "CLOSED"
+        first.line_items[0].description = "Changed"
+
+        second = service.get_po_by_number("PO-2024-001")
+        assert second.status != "CLOSED"
+        assert second.line_items[0].description == "Office Chairs"
+
+    def test_update_invalidates_other_instances(self, service):
+        """Test that an update through one service is visible to another"""
+        other = POService()
+        assert other.get_po_by_number("PO-2024-001").status == "OPEN"
+
+        service.update_po("PO-2024-001", {"status": "CLOSED"})
+
+        assert other.get_po_by_number("PO-2024-001").status == "CLOSED"
+
+    def test_delete_invalidates(self, service):
+        """Test that a deleted PO is no longer served from the cache"""
+        assert service.get_po_by_number("PO-2024-001") is not None
+
+        assert service.delete_po("PO-2024-001") is True
+
+        assert service.get_po_by_number("PO-2024-001") is None
+
+    def test_invalidate_cached_pos(self, service, session_factory):
+        """Test explicit invalidation used by writers outside POService"""
+        service.get_po_by_number("PO-2024-001")
+        _delete_behind_service(session_factory, "PO-2024-001")
+
+        invalidate_cached_pos("po-2024-001")
+
+        assert service.get_po_by_number("PO-2024-001") is None
+
+    def test_caller_session_bypasses_cache(self, service, session_factory):
+        """Test that lookups in a caller's transaction neither read nor fill the cache"""
+        db = session_factory()
+        try:
+            assert service.create_po(_po_data("PO-2024-002"), db=db) is not None
+            assert service.get_po_by_number("PO-2024-002", db=db) is not None
+            db.rollback()
+        finally:
+            db.close()
+
+        assert service.get_po_by_number("PO-2024-002") is None
+
+    def test_caller_update_invalidates_on_commit(self, service, session_factory):
+        """Test that a PO re-cached mid-transaction is dropped when the caller commits"""
+        db = session_factory()
+        try:
+            service.update_po("PO-2024-001", {"status": "CLOSED"}, db=db)
+            # A concurrent reader caches the committed, pre-update row
+            assert service.get_po_by_number("PO-2024-001").status == "OPEN"
+            db.commit()
+        finally:
+            db.close()
+
+        assert service.get_po_by_number("PO-2024-001").status == "CLOSED"
+
+
+class TestCreatePOs:
+    """Test single and bulk PO creation"""
+
+    def test_create_po_returns_server_timestamps(self):
+        """Test that created POs carry the database-stamped timestamps"""
+        po = POService().create_po(_po_data())
+
+        assert isinstance(po.created_at, datetime)
+        assert isinstance(po.updated_at, datetime)
+
+    def test_bulk_inserts_line_items(self, session_factory):
+        """Test that bulk creation stores every PO with its numbered line items"""
+        svc = POService()
+        second = _po_data("PO-2024-002", total="500.00")
+        second["line_items"].append(
+            {
+                "description": "Desk Lamps",
+                "quantity": 2,
+                "unit_price": Decimal("25.00"),
+                "total_price": Decimal("50.00"),
+            }
+        )
+        second["total_authorized"] = Decimal("550.00")
+
+        created = svc.create_pos_bulk([_po_data(), second])
+
+        assert [po.po_number for po in created] == ["PO-2024-001", "PO-2024-002"]
+        assert all(po.created_at is not None for po in created)
+        with session_factory() as db:
+            assert db.query(POLineItemDB).count() == 3
+        stored = svc.get_po_by_number("PO-2024-002")
+        assert [item.description for item in stored.line_items] == [
+            "Office Chairs",
+            "Desk Lamps",
+        ]
+        assert stored.line_items[1].total_price == Decimal("50.00")
+
+    def test_bulk_validation_failure_writes_nothing(self, session_factory):
+        """Test that one invalid payload rejects the whole batch"""
+        invalid = _po_data("PO-2024-002")
+        invalid["line_items"][0]["total_price"] = Decimal("1.00")
+
+        assert POService().create_pos_bulk([_po_data(), invalid]) == []
+
+        with session_factory() as db:
+            assert db.query(PurchaseOrderDB).count() == 0
+
+    def test_missing_field_returns_none(self):
+        """Test that create_po rejects payloads without required fields"""
+        data = _po_data()
+        del data["vendor_name"]
+
+        assert POService().create_po(data) is None
+
+    def test_duplicate_po_number_rolls_back_batch(self, service, session_factory):
+        """Test that a duplicate PO number fails the batch without partial writes"""
+        assert service.create_po(_po_data()) is None
+        assert service.create_pos_bulk([_po_data("PO-2024-002"), _po_data()]) == []
+
+        with session_factory() as db:
+            assert db.query(PurchaseOrderDB).count() == 1
+            assert db.query(POLineItemDB).count() == 1
+
+
+class TestIterAllPos:
+    """Test streaming every PO"""
+
+    def test_streams_line_items_by_default(self, service):
+        """Test that streamed POs carry their line items"""
+        service.create_po(_po_data("PO-2024-002", total="500.00"))
+
+        pos = list(service.iter_all_pos(batch_size=1))
+
+        assert [po.po_number for po in pos] == ["PO-2024-001", "PO-2024-002"]
+        assert all(len(po.line_items) == 1 for po in pos)
+
+    def test_headers_only(self, service):
+        """Test that with_line_items=False streams headers without loading line items"""
+        with patch.object(po_service_module, "_load_line_items") as load_line_items:
+            pos = list(service.iter_all_pos(with_line_items=False))
+
+        load_line_items.assert_not_called()
+        assert [po.po_number for po in pos] == ["PO-2024-001"]
+        assert pos[0].vendor_name == "ABC Supplies Inc."
+        assert pos[0].line_items == []
+
+    def test_fuzzy_vendor_match_loads_winner_line_items(self, service):
+        """Test that the fuzzy matcher returns the winning PO with its line items"""
+        from app.core.po_matcher import POMatcher
+
+        invoice = SimpleNamespace(vendor_name="abc supplies inc.")
+
+        po = POMatcher(service)._find_po_by_fuzzy_vendor(invoice)
+
+        assert po.po_number == "PO-2024-001"
+        assert len(po.line_items) == 1
+
+
+class TestPOStatistics:
+    """Test the summary-table fallback in get_po_statistics"""
+
+    def test_transient_error_probes_again(self, service):
+        """Test that a non-missing-table error falls back for that call only"""
+        error = OperationalError("SELECT", {}, Exception("connection reset"))
+        with patch.object(POService, "_read_cached_po_statistics", side_effect=error):
+            stats = service.get_po_statistics()
+
+        assert stats["total_pos"] == 1
+        assert service._stats_cache_available is None
+
+    def test_missing_tables_latch_fallback(self, service):
+        """Test that an undefined_table error switches to aggregation for good"""
+        error = ProgrammingError(
+            "SELECT", {}, SimpleNamespace(pgcode="42P01", args=("relation does not exist",))
+        )
+        with patch.object(POService, "_read_cached_po_statistics", side_effect=error) as read:
+            service.get_po_statistics()
+            stats = service.get_po_statistics()
+
+        assert stats["total_pos"] == 1
+        assert service._stats_cache_available is False
+        assert read.call_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])